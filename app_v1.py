@@ -3,18 +3,33 @@ Application Streamlit V1 - Version simplifiée pour la génération de rapports
 Interface épurée : upload template + excel → génération directe.
 """
 
+import importlib
+import logging
+import re
+import threading
+import unicodedata
 import streamlit as st
-from pathlib import Path
+from collections import defaultdict
 from io import BytesIO
-
-# Imports des modules
-from src.flat_loader import FlatLoader, ExcelValidationError
-from src.tree import OrganizationTree
-from src.calc_emissions import EmissionCalculator, EmissionOverrides, EmissionResult
-from src.calc_indicators import IndicatorCalculator
-from src.content_catalog import ContentCatalog
-from src.kpi_calculators import KPICalculator
-from src.word_renderer import WordRenderer
+from typing import TYPE_CHECKING, Any, Dict
+
+# Les modules src (pandas, python-docx, matplotlib) sont importés dans les
+# fonctions qui s'en servent : la page s'affiche sans les attendre, et
+# _start_import_warmup() les charge en arrière-plan pendant les uploads.
+if TYPE_CHECKING:
+    from src.word_renderer import WordRenderer
+
+logger = logging.getLogger(__name__)
+
+# Modules préchargés au démarrage (word_renderer tire calc_emissions,
+# chart_generators et kpi_calculators)
+_WARMUP_MODULES = (
+    'src.flat_loader',
+    'src.tree',
+    'src.calc_indicators',
+    'src.content_catalog',
+    'src.word_renderer',
+)
 
 
 # Configuration de la page
@@ -94,219 +109,347 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 
+# Variables de session et leurs valeurs initiales
+_SESSION_DEFAULTS = (
+    ('template_bytes', None),
+    ('template_file_id', None),
+    ('excel_bytes', None),
+    ('excel_file_id', None),
+    ('report_generated', False),
+    ('report_data', None),
+    ('error_message', None),
+    ('org_name', None),
+)
+
+
+def _warm_imports():
+    """Importe les modules lourds ; un module introuvable est signalé dans les logs."""
+    for module_name in _WARMUP_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            logger.exception("Préchargement de %s impossible", module_name)
+
+
+@st.cache_resource(show_spinner=False)
+def _start_import_warmup() -> threading.Thread:
+    """Lance une seule fois par processus le préchargement des modules."""
+    thread = threading.Thread(target=_warm_imports, name="import-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
 def init_session_state():
     """Initialise les variables de session."""
-    if 'template_file' not in st.session_state:
-        st.session_state.template_file = None
-    if 'excel_file' not in st.session_state:
-        st.session_state.excel_file = None
-    if 'report_generated' not in st.session_state:
-        st.session_state.report_generated = False
-    if 'report_data' not in st.session_state:
-        st.session_state.report_data = None
-    if 'error_message' not in st.session_state:
-        st.session_state.error_message = None
-    if 'org_name' not in st.session_state:
-        st.session_state.org_name = None
-
-
-def generate_report_v1(template_file, excel_file, annee: int = 2024):
+    for key, default in _SESSION_DEFAULTS:
+        st.session_state.setdefault(key, default)
+
+
+def _store_upload(uploaded_file, key: str):
+    """
+    Garde en session le contenu brut d'un fichier uploadé.
+
+    Seuls les octets sont conservés (pas l'objet UploadedFile), et ils ne
+    sont recopiés que lorsqu'un nouveau fichier est déposé.
+
+    Args:
+        uploaded_file: Fichier retourné par st.file_uploader
+        key: Préfixe des variables de session ('template' ou 'excel')
+    """
+    id_key = f'{key}_file_id'
+    if st.session_state[id_key] != uploaded_file.file_id:
+        st.session_state[f'{key}_bytes'] = uploaded_file.getvalue()
+        st.session_state[id_key] = uploaded_file.file_id
+
+
+# Caractères retirés des noms de fichiers (les accents sont décomposés avant)
+_FNAME_RE = re.compile(r'[^\w\s-]')
+
+
+def _clean_filename_part(name: str) -> str:
+    """
+    Nettoie un nom pour l'utiliser dans un nom de fichier.
+
+    Ex: 'Société d'Eau' -> 'Societe_dEau'
+    """
+    normalized = unicodedata.normalize('NFKD', name)
+    return _FNAME_RE.sub('', normalized).strip().replace(' ', '_')
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_excel(excel_bytes: bytes):
+    """
+    Charge et valide l'Excel, mis en cache sur le contenu du fichier.
+
+    Streamlit relance tout le script à chaque interaction : sans cache,
+    le même classeur serait relu et revalidé à chaque génération.
+
+    Args:
+        excel_bytes: Contenu brut du fichier Excel uploadé
+
+    Returns:
+        Tuple (data, auto_overrides)
+    """
+    from src.flat_loader import FlatLoader, ExcelValidationError
+
+    loader = FlatLoader(BytesIO(excel_bytes))
+    data = loader.load()
+
+    # Vérifier les warnings
+    errors, warnings = loader.get_validation_report()
+    if errors:
+        raise ExcelValidationError(f"Erreurs de validation : {', '.join(errors)}")
+
+    return data, loader.get_auto_overrides()
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_model(excel_bytes: bytes) -> Dict[str, Any]:
+    """
+    Construit l'arborescence, les calculateurs et les résultats,
+    mis en cache sur le contenu du fichier Excel.
+
+    Les objets retournés sont partagés entre sessions : ils ne doivent
+    pas être modifiés par l'appelant.
+
+    Args:
+        excel_bytes: Contenu brut du fichier Excel uploadé
+
+    Returns:
+        Dictionnaire {data, tree, emission_calc, content_catalog,
+        results_brut, indicator_results, lot_results, results_by_activity,
+        indicators_by_activity, activity_totals}
+    """
+    from src.tree import OrganizationTree
+    from src.calc_emissions import EmissionCalculator, EmissionResult
+    from src.calc_indicators import IndicatorCalculator
+    from src.content_catalog import ContentCatalog
+
+    data, auto_overrides = _load_excel(excel_bytes)
+
+    # Construire l'arborescence
+    tree = OrganizationTree(data['ORG_TREE'])
+
+    # Valider la structure
+    tree_errors = tree.validate_structure()
+    if tree_errors:
+        raise ValueError(f"Erreurs dans l'arborescence : {', '.join(tree_errors)}")
+
+    # Créer les calculateurs
+    emission_calc = EmissionCalculator(
+        tree,
+        data['EMISSIONS'],
+        data['POSTES_REF']
+    )
+
+    indicator_calc = IndicatorCalculator(
+        tree,
+        data['INDICATORS'],
+        data['INDICATORS_REF']
+    )
+
+    content_catalog = ContentCatalog(data['TEXTE_RAPPORT'])
+
+    # Calculer les résultats (avec overrides auto)
+    if auto_overrides.poste_config:
+        results_brut = emission_calc.calculate_net(auto_overrides, top_n=4)
+    else:
+        results_brut = emission_calc.calculate_brut(top_n=4)
+    indicator_results = indicator_calc.calculate()
+
+    # Vues dérivées, calculées une fois pour toutes les générations :
+    # résultats LOT/ORG × activité, et regroupements par activité
+    # (l'activité est portée par chaque résultat : ORG n'en a pas)
+    lot_results = {k: v for k, v in results_brut.items() if k.startswith(('LOT_', 'ORG_'))}
+
+    results_by_activity = defaultdict(list)
+    indicators_by_activity = defaultdict(list)
+    for key, result in results_brut.items():
+        if result.activity:
+            results_by_activity[result.activity].append(result)
+        ind_result = indicator_results.get(key)
+        if ind_result is not None:
+            indicators_by_activity[ind_result.activity].append(ind_result)
+
+    return {
+        'data': data,
+        'tree': tree,
+        'emission_calc': emission_calc,
+        'content_catalog': content_catalog,
+        'results_brut': results_brut,
+        'indicator_results': indicator_results,
+        'lot_results': lot_results,
+        'results_by_activity': dict(results_by_activity),
+        'indicators_by_activity': dict(indicators_by_activity),
+        'activity_totals': {
+            activity: EmissionResult.aggregate(activity_results, node_id='ORG', activity=activity)
+            for activity, activity_results in results_by_activity.items()
+        },
+    }
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _get_renderer(template_bytes: bytes) -> "WordRenderer":
+    """
+    Construit le renderer Word, mis en cache sur le contenu du template.
+
+    Le template est gardé en mémoire et re-parsé à chaque rendu : le
+    document produit n'est jamais partagé entre deux générations.
+
+    Args:
+        template_bytes: Contenu brut du template Word uploadé
+
+    Returns:
+        WordRenderer prêt à l'emploi
+    """
+    from src.word_renderer import WordRenderer
+
+    return WordRenderer(template_path=BytesIO(template_bytes), assets_path="assets")
+
+
+@st.cache_resource
+def _render_lock() -> threading.Lock:
+    """
+    Verrou partagé entre sessions pour la génération du rapport.
+
+    Protège le WordRenderer mis en cache, les figures matplotlib réutilisées
+    par son ChartGenerator et l'état global de matplotlib (rcParams, polices),
+    qui ne sont pas thread-safe.
+    """
+    return threading.Lock()
+
+
+def generate_report_v1(template_bytes: bytes, excel_bytes: bytes, annee: int = 2024):
     """
     Génère le rapport Word (version simplifiée V1).
 
     Args:
-        template_file: Fichier template Word uploadé
-        excel_file: Fichier Excel uploadé
+        template_bytes: Contenu brut du template Word uploadé
+        excel_bytes: Contenu brut du fichier Excel uploadé
         annee: Année du bilan
 
     Returns:
-        BytesIO: Document Word généré, ou None si erreur
+        bytes: Contenu du document Word généré
     """
-    try:
-        # 1. Sauvegarder temporairement les fichiers
-        temp_excel_path = Path("temp_upload.xlsx")
-        temp_template_path = Path("temp_template.docx")
-
-        with open(temp_excel_path, "wb") as f:
-            f.write(excel_file.getbuffer())
-
-        with open(temp_template_path, "wb") as f:
-            f.write(template_file.getbuffer())
-
-        # 2. Charger et valider l'Excel
-        loader = FlatLoader(str(temp_excel_path))
-        data = loader.load()
-
-        # Vérifier les warnings
-        errors, warnings = loader.get_validation_report()
-        if errors:
-            raise ExcelValidationError(f"Erreurs de validation : {', '.join(errors)}")
-
-        # 3. Construire l'arborescence
-        tree = OrganizationTree(data['ORG_TREE'])
-
-        # Valider la structure
-        tree_errors = tree.validate_structure()
-        if tree_errors:
-            raise ValueError(f"Erreurs dans l'arborescence : {', '.join(tree_errors)}")
-
-        # Stocker le nom de l'organisation dans session_state pour le nom du fichier
-        org = tree.get_org()
-        import streamlit as st
-        st.session_state.org_name = org.node_name
-
-        # 4. Créer les calculateurs
-        emission_calc = EmissionCalculator(
-            tree,
-            data['EMISSIONS'],
-            data['POSTES_REF']
-        )
+    # Stocker le nom de l'organisation dans session_state pour le nom du fichier
+    # (hors du cache du rendu : un effet de bord n'y serait pas rejoué)
+    org = _build_model(excel_bytes)['tree'].get_org()
+    st.session_state.org_name = org.node_name
 
-        indicator_calc = IndicatorCalculator(
-            tree,
-            data['INDICATORS'],
-            data['INDICATORS_REF']
-        )
+    return _render_report(template_bytes, excel_bytes, annee)
 
-        content_catalog = ContentCatalog(data['TEXTE_RAPPORT'])
-
-        # 5. Calculer les résultats (avec overrides auto)
-        auto_overrides = loader.get_auto_overrides()
-        if auto_overrides.poste_config:
-            results_brut = emission_calc.calculate_net(auto_overrides, top_n=4)
-        else:
-            results_brut = emission_calc.calculate_brut(top_n=4)
-        indicator_results = indicator_calc.calculate()
-
-        # 6. Calculer les KPI m³
-        kpi_calc = KPICalculator()
-        kpi_m3_eu = None
-        kpi_m3_aep = None
-
-        # Collecter tous les résultats EU
-        eu_results_list = []
-        eu_indicators_list = []
-        for key, result in results_brut.items():
-            if '_EU' in key:
-                eu_results_list.append(result)
-            if key in indicator_results:
-                ind_result = indicator_results[key]
-                if ind_result.activity == 'EU':
-                    eu_indicators_list.append(ind_result)
-
-        # Collecter tous les résultats AEP
-        aep_results_list = []
-        aep_indicators_list = []
-        for key, result in results_brut.items():
-            if '_AEP' in key:
-                aep_results_list.append(result)
-            if key in indicator_results:
-                ind_result = indicator_results[key]
-                if ind_result.activity == 'AEP':
-                    aep_indicators_list.append(ind_result)
-
-        # Calculer le KPI EU global
-        if eu_results_list and eu_indicators_list:
-            total_eu_tco2e = sum(r.total_tco2e for r in eu_results_list)
-            eu_total_result = EmissionResult(
-                node_id='ORG',
-                node_name='ORG',
-                activity='EU',
-                total_tco2e=total_eu_tco2e,
-                scope1_tco2e=sum(r.scope1_tco2e for r in eu_results_list),
-                scope2_tco2e=sum(r.scope2_tco2e for r in eu_results_list),
-                scope3_tco2e=sum(r.scope3_tco2e for r in eu_results_list),
-                emissions_by_poste={},
-                top_postes=[],
-                other_postes=[]
-            )
-            kpi_m3_eu = kpi_calc.calculate_kpi_m3_eu(eu_total_result, eu_indicators_list)
-
-        # Calculer le KPI AEP global
-        if aep_results_list and aep_indicators_list:
-            total_aep_tco2e = sum(r.total_tco2e for r in aep_results_list)
-            aep_total_result = EmissionResult(
-                node_id='ORG',
-                node_name='ORG',
-                activity='AEP',
-                total_tco2e=total_aep_tco2e,
-                scope1_tco2e=sum(r.scope1_tco2e for r in aep_results_list),
-                scope2_tco2e=sum(r.scope2_tco2e for r in aep_results_list),
-                scope3_tco2e=sum(r.scope3_tco2e for r in aep_results_list),
-                emissions_by_poste={},
-                top_postes=[],
-                other_postes=[]
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _render_report(template_bytes: bytes, excel_bytes: bytes, annee: int) -> bytes:
+    """
+    Calcule les KPI et rend le rapport, mis en cache sur (template, excel, année).
+
+    Regénérer avec des entrées identiques renvoie directement le document
+    déjà produit ; max_entries borne la mémoire occupée par les .docx.
+
+    Args:
+        template_bytes: Contenu brut du template Word
+        excel_bytes: Contenu brut du fichier Excel
+        annee: Année du bilan
+
+    Returns:
+        Contenu du document Word généré
+    """
+    from src.calc_emissions import EmissionOverrides
+    from src.kpi_calculators import KPICalculator
+
+    # 1. Charger l'Excel et construire les calculs (mis en cache)
+    model = _build_model(excel_bytes)
+    data = model['data']
+    tree = model['tree']
+    emission_calc = model['emission_calc']
+    content_catalog = model['content_catalog']
+    results_brut = model['results_brut']
+    indicator_results = model['indicator_results']
+
+    # 2. Calculer les KPI m³ globaux EU et AEP (regroupements pré-calculés)
+    kpi_calc = KPICalculator()
+    results_by_activity = model['results_by_activity']
+    indicators_by_activity = model['indicators_by_activity']
+    activity_totals = model['activity_totals']
+
+    kpi_m3 = {}
+    for activity in ('EU', 'AEP'):
+        activity_indicators = indicators_by_activity.get(activity)
+        if results_by_activity.get(activity) and activity_indicators:
+            kpi_m3[activity] = kpi_calc.calculate_kpi_m3(
+                activity, activity_totals[activity], activity_indicators
             )
-            kpi_m3_aep = kpi_calc.calculate_kpi_m3_aep(aep_total_result, aep_indicators_list)
-
-        # 6b. Texte de comparaison volumes EU/AEP
-        eu_first_result = eu_results_list[0] if eu_results_list else None
-        aep_first_result = aep_results_list[0] if aep_results_list else None
-        eu_ind_first = eu_indicators_list[0] if eu_indicators_list else None
-        aep_ind_first = aep_indicators_list[0] if aep_indicators_list else None
-        activity_comparison = kpi_calc.generate_activity_volume_comparison_text(
-            eu_first_result, aep_first_result, eu_ind_first, aep_ind_first
-        )
 
-        # 7. Calculer les données chauffage AEP
+    eu_results_list = results_by_activity.get('EU', [])
+    eu_indicators_list = indicators_by_activity.get('EU', [])
+    aep_results_list = results_by_activity.get('AEP', [])
+    aep_indicators_list = indicators_by_activity.get('AEP', [])
+
+    # 2b. Texte de comparaison volumes EU/AEP
+    eu_first_result = eu_results_list[0] if eu_results_list else None
+    aep_first_result = aep_results_list[0] if aep_results_list else None
+    eu_ind_first = eu_indicators_list[0] if eu_indicators_list else None
+    aep_ind_first = aep_indicators_list[0] if aep_indicators_list else None
+    activity_comparison = kpi_calc.generate_activity_volume_comparison_text(
+        eu_first_result, aep_first_result, eu_ind_first, aep_ind_first
+    )
+
+    renderer = _get_renderer(template_bytes)
+
+    # 3. Calculer les données chauffage AEP (seulement si le template a la section)
+    with _render_lock():
+        has_chauffage_section = renderer.has_block('[[START_CHAUFFAGE_INCLUS]]')
+    if has_chauffage_section:
         aep_with_chauffage = emission_calc.calculate_aep_with_chauffage()
         chauffage_total = emission_calc.get_chauffage_total()
         org_with_chauffage = emission_calc.calculate_org_with_chauffage()
+    else:
+        aep_with_chauffage = None
+        chauffage_total = 0.0
+        org_with_chauffage = None
+
+    # 4. Préparer le contexte pour le rendu
+    overrides = EmissionOverrides()  # Vide pour V1
+
+    context = {
+        'annee': annee,
+        'org_result': results_brut.get('ORG'),
+        'lot_results': model['lot_results'],
+        'has_lots': tree.has_lots(),
+        'poste_labels': emission_calc.poste_labels,
+        'top_n': 4,
+        'overrides': overrides,
+        'emissions_df': data.get('EMISSIONS'),
+        'emissions_l2_df': data.get('EMISSIONS_L2'),
+        'content_catalog': content_catalog,
+        'tree': tree,
+        'indicator_results': indicator_results,
+        'kpi_m3_eu': kpi_m3.get('EU'),
+        'kpi_m3_aep': kpi_m3.get('AEP'),
+        'aep_with_chauffage_result': aep_with_chauffage,
+        'chauffage_total_tco2e': chauffage_total,
+        'org_with_chauffage_result': org_with_chauffage,
+        'beges_df': data.get('BEGES'),
+        'emissions_evitees_df': data.get('EMISSIONS_EVITEES'),
+        'activity_volume_comparison_text': activity_comparison,
+    }
 
-        # 8. Préparer le contexte pour le rendu
-        overrides = EmissionOverrides()  # Vide pour V1
-
-        context = {
-            'annee': annee,
-            'org_result': results_brut.get('ORG'),
-            'lot_results': {k: v for k, v in results_brut.items() if k.startswith('LOT_') or k.startswith('ORG_')},
-            'has_lots': tree.has_lots(),
-            'poste_labels': emission_calc.poste_labels,
-            'top_n': 4,
-            'overrides': overrides,
-            'emissions_df': data.get('EMISSIONS'),
-            'emissions_l2_df': data.get('EMISSIONS_L2'),
-            'content_catalog': content_catalog,
-            'tree': tree,
-            'indicator_results': indicator_results,
-            'kpi_m3_eu': kpi_m3_eu,
-            'kpi_m3_aep': kpi_m3_aep,
-            'aep_with_chauffage_result': aep_with_chauffage,
-            'chauffage_total_tco2e': chauffage_total,
-            'org_with_chauffage_result': org_with_chauffage,
-            'beges_df': data.get('BEGES'),
-            'emissions_evitees_df': data.get('EMISSIONS_EVITEES'),
-            'activity_volume_comparison_text': activity_comparison,
-        }
-
-        # 9. Générer le rapport Word
-        renderer = WordRenderer(
-            template_path=str(temp_template_path),
-            assets_path="assets"
-        )
-
-        doc = renderer.render(context)
-
-        # 10. Sauvegarder dans un BytesIO
-        output_buffer = BytesIO()
-        renderer.doc.save(output_buffer)
-        output_buffer.seek(0)
-
-        # 11. Nettoyer les fichiers temporaires
-        temp_excel_path.unlink(missing_ok=True)
-        temp_template_path.unlink(missing_ok=True)
+    # 5. Générer le rapport Word (renderer mis en cache par template)
+    with _render_lock():
+        renderer.render(context)
 
-        return output_buffer
+        # 6. Sérialiser en mémoire pour le téléchargement
+        try:
+            return renderer.to_bytes()
+        finally:
+            renderer.release()
 
-    except Exception as e:
-        # Nettoyer les fichiers temporaires en cas d'erreur
-        Path("temp_upload.xlsx").unlink(missing_ok=True)
-        Path("temp_template.docx").unlink(missing_ok=True)
-        raise e
 
 
 def main():
     """Fonction principale de l'application V1."""
+    _start_import_warmup()
     init_session_state()
 
     # Titre principal
@@ -343,7 +486,7 @@ def main():
 
         if template_file:
             st.success(f"✅ {template_file.name}")
-            st.session_state.template_file = template_file
+            _store_upload(template_file, 'template')
 
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -360,14 +503,14 @@ def main():
 
         if excel_file:
             st.success(f"✅ {excel_file.name}")
-            st.session_state.excel_file = excel_file
+            _store_upload(excel_file, 'excel')
 
         st.markdown('</div>', unsafe_allow_html=True)
 
     st.markdown("<br><br>", unsafe_allow_html=True)
 
     # Bouton de génération (toujours visible, désactivé si fichiers manquants)
-    can_generate = st.session_state.template_file and st.session_state.excel_file
+    can_generate = st.session_state.template_bytes and st.session_state.excel_bytes
 
     if st.button("🚀 Générer le rapport", disabled=not can_generate):
         if can_generate:
@@ -380,15 +523,15 @@ def main():
             with st.spinner("⏳ Génération du rapport en cours..."):
                 try:
                     # Générer le rapport
-                    report_buffer = generate_report_v1(
-                        st.session_state.template_file,
-                        st.session_state.excel_file,
+                    report_bytes = generate_report_v1(
+                        st.session_state.template_bytes,
+                        st.session_state.excel_bytes,
                         annee
                     )
 
                     # Succès
                     st.session_state.report_generated = True
-                    st.session_state.report_data = report_buffer
+                    st.session_state.report_data = report_bytes
                     st.session_state.error_message = None
 
                 except Exception as e:
@@ -397,8 +540,7 @@ def main():
                     st.session_state.report_data = None
                     st.session_state.error_message = str(e)
 
-            # Forcer le rafraîchissement pour afficher le résultat
-            st.rerun()
+            # Pas de st.rerun() : le résultat est affiché plus bas dans ce même run
 
     # Afficher le message de succès
     if st.session_state.report_generated and st.session_state.report_data:
@@ -409,9 +551,7 @@ def main():
 
         # Bouton de téléchargement
         # Nettoyer le nom de l'organisation pour le nom de fichier
-        import re
-        org_name = st.session_state.org_name or "Organisation"
-        org_name_clean = re.sub(r'[^\w\s-]', '', org_name).strip().replace(' ', '_')
+        org_name_clean = _clean_filename_part(st.session_state.org_name or "Organisation")
 
         st.download_button(
             label="📥 Télécharger le rapport",
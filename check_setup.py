@@ -5,6 +5,7 @@ Lance ce script pour vérifier que tout est prêt avant de démarrer l'app.
 """
 
 import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 
@@ -33,17 +34,13 @@ def check_dependencies():
         'PIL'
     ]
 
+    # find_spec localise le module sans l'exécuter (importer streamlit ou
+    # matplotlib prendrait plusieurs secondes pour un simple contrôle)
     missing = []
     for module in required:
-        try:
-            if module == 'docx':
-                __import__('docx')
-            elif module == 'PIL':
-                __import__('PIL')
-            else:
-                __import__(module)
+        if find_spec(module) is not None:
             print(f"   ✅ {module}")
-        except ImportError:
+        else:
             print(f"   ❌ {module} (manquant)")
             missing.append(module)
 
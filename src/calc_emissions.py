@@ -3,9 +3,11 @@ Module de calcul des émissions.
 Gère les agrégations ORG, LOT×ACTIVITÉ, scopes, top postes et calculs BRUT/NET.
 """
 
+import numpy as np
 import pandas as pd
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 
 from .tree import OrganizationTree, TreeNode
 
@@ -49,6 +51,13 @@ class EmissionOverrides:
             if not config.get('include_in_totals', True)
         ]
 
+    def get_hidden_postes(self) -> List[str]:
+        """Retourne la liste des postes masqués dans le rapport."""
+        return [
+            code for code, config in self.poste_config.items()
+            if not config.get('show_in_report', True)
+        ]
+
 
 @dataclass
 class EmissionResult:
@@ -79,6 +88,39 @@ class EmissionResult:
         scope_value = getattr(self, f'scope{scope}_tco2e', 0.0)
         return (scope_value / self.total_tco2e) * 100
 
+    @classmethod
+    def aggregate(cls, results: List['EmissionResult'], node_id: str,
+                  activity: Optional[str], node_name: Optional[str] = None) -> 'EmissionResult':
+        """
+        Somme les totaux et scopes de plusieurs résultats (ex: tous les LOT d'une activité).
+
+        Args:
+            results: Résultats à agréger
+            node_id: ID du nœud du résultat agrégé
+            activity: Activité du résultat agrégé
+            node_name: Nom du nœud (node_id par défaut)
+
+        Returns:
+            EmissionResult sans détail par poste
+        """
+        totals = np.zeros(4)
+        if results:
+            totals = np.array(
+                [(r.total_tco2e, r.scope1_tco2e, r.scope2_tco2e, r.scope3_tco2e) for r in results],
+                dtype=np.float64
+            ).sum(axis=0)
+        total, scope1, scope2, scope3 = totals.tolist()
+
+        return cls(
+            node_id=node_id,
+            node_name=node_name if node_name is not None else node_id,
+            activity=activity,
+            total_tco2e=total,
+            scope1_tco2e=scope1,
+            scope2_tco2e=scope2,
+            scope3_tco2e=scope3
+        )
+
 
 class EmissionCalculator:
     """
@@ -100,6 +142,10 @@ class EmissionCalculator:
         self.emissions_df = emissions_df
         self.postes_ref_df = postes_ref_df
 
+        # Cache des calculs par configuration de postes (propre à l'instance :
+        # recharger les données = nouveau calculateur = cache vide)
+        self._calculate_cached = lru_cache(maxsize=8)(self._calculate_for_postes)
+
         # Préparer les données
         self._prepare_data()
 
@@ -108,10 +154,41 @@ class EmissionCalculator:
         # Normaliser les scopes en int
         self.emissions_df['scope'] = self.emissions_df['scope'].astype(int)
 
+        # Tenseur des émissions [ENT, scope, poste] sommées en une seule passe :
+        # BRUT, NET et les sous-périmètres s'obtiennent ensuite par simples sommes
+        # sur ce tenseur, sans repasser sur les lignes d'EMISSIONS.
+        node_codes, node_uniques = pd.factorize(self.emissions_df['node_id'])
+        scopes = self.emissions_df['scope'].to_numpy(dtype=np.int64)
+        tco2e = self.emissions_df['tco2e'].to_numpy(dtype=np.float64)
+
+        # Postes L1 triés comme le serait la sortie d'un groupby ; la dernière
+        # colonne du tenseur reçoit les lignes sans poste
+        poste_codes, poste_uniques = pd.factorize(self.emissions_df['poste_l1_code'], sort=True)
+        self._poste_uniques = list(poste_uniques)
+        n_postes = len(self._poste_uniques)
+        poste_codes = np.where(poste_codes >= 0, poste_codes, n_postes)
+
+        valid = (node_codes >= 0) & (scopes >= 0)
+        index = (node_codes[valid], scopes[valid], poste_codes[valid])
+        n_scopes = max(4, int(scopes.max()) + 1) if len(scopes) else 4
+
+        self._node_index: Dict[str, int] = {node_id: i for i, node_id in enumerate(node_uniques)}
+        self._emissions_by_node = np.zeros((len(node_uniques), n_scopes, n_postes + 1))
+        np.add.at(self._emissions_by_node, index, tco2e[valid])
+        # Nombre de lignes par [ENT, poste] : un poste présent à 0 tCO2e reste listé
+        self._row_counts_by_node = np.zeros((len(node_uniques), n_postes + 1), dtype=np.int64)
+        np.add.at(self._row_counts_by_node, (index[0], index[2]), 1)
+
+        # Masque « tous postes » (BRUT ou overrides sans configuration de postes)
+        self._all_postes_with_missing = np.ones(n_postes + 1, dtype=bool)
+
+        # Périmètres d'ENT, construits une fois (l'arborescence ne change pas)
+        self._org_ent_ids = [ent.node_id for ent in self.tree.get_ents()]
+        self._ent_ids_by_activity: Dict[Tuple[str, str], List[str]] = {}
+
         # Créer un dictionnaire des labels de postes
-        self.poste_labels = {}
-        for _, row in self.postes_ref_df.iterrows():
-            self.poste_labels[row['poste_l1_code']] = row['poste_l1_label']
+        self.poste_labels = dict(zip(self.postes_ref_df['poste_l1_code'],
+                                     self.postes_ref_df['poste_l1_label']))
 
     def calculate_brut(self, top_n: int = 4) -> Dict[str, EmissionResult]:
         """
@@ -124,12 +201,16 @@ class EmissionCalculator:
             Dictionnaire {key: EmissionResult}
             Keys format: 'ORG', 'LOT_{lot_id}_{activity}'
         """
-        return self._calculate(EmissionOverrides(), top_n)
+        return self.calculate_net(EmissionOverrides(), top_n)
 
     def calculate_net(self, overrides: EmissionOverrides, top_n: int = 4) -> Dict[str, EmissionResult]:
         """
         Calcule les émissions NET (avec overrides).
 
+        Les calculs sont mémorisés par (poste_config, top_n) : un simple
+        renommage de nœud ne relance pas les agrégations. Les résultats
+        sont partagés entre appels et ne doivent pas être modifiés.
+
         Args:
             overrides: Configuration des overrides
             top_n: Nombre de top postes à calculer
@@ -137,6 +218,35 @@ class EmissionCalculator:
         Returns:
             Dictionnaire {key: EmissionResult}
         """
+        poste_items = tuple(sorted(
+            (code, tuple(sorted(config.items())))
+            for code, config in overrides.poste_config.items()
+        ))
+        results = self._calculate_cached(poste_items, top_n)
+
+        if not overrides.node_renames:
+            return dict(results)
+
+        # Appliquer les renommages sur des copies (le cache garde les noms d'origine)
+        return {
+            key: replace(result, node_name=overrides.get_node_name(result.node_id, result.node_name))
+            for key, result in results.items()
+        }
+
+    def _calculate_for_postes(self, poste_items: tuple, top_n: int) -> Dict[str, EmissionResult]:
+        """
+        Calcule les émissions pour une configuration de postes figée (clé du cache).
+
+        Args:
+            poste_items: poste_config sous forme de tuple trié (hashable)
+            top_n: Nombre de top postes
+
+        Returns:
+            Dictionnaire des résultats, noms de nœuds d'origine
+        """
+        overrides = EmissionOverrides(
+            poste_config={code: dict(config) for code, config in poste_items}
+        )
         return self._calculate(overrides, top_n)
 
     def _calculate(self, overrides: EmissionOverrides, top_n: int) -> Dict[str, EmissionResult]:
@@ -177,13 +287,11 @@ class EmissionCalculator:
     def _calculate_org(self, overrides: EmissionOverrides, top_n: int) -> EmissionResult:
         """Calcule les émissions au niveau ORG (tous ENT confondus)."""
         org = self.tree.get_org()
-        all_ents = self.tree.get_ents()
-        ent_ids = [ent.node_id for ent in all_ents]
 
         return self._aggregate_emissions(
             node_id=org.node_id,
             node_name=overrides.get_node_name(org.node_id, org.node_name),
-            ent_ids=ent_ids,
+            ent_ids=self._org_ent_ids,
             activity=None,
             overrides=overrides,
             top_n=top_n
@@ -193,7 +301,7 @@ class EmissionCalculator:
                                 top_n: int) -> EmissionResult:
         """Calcule les émissions ORG × ACTIVITÉ (cas sans LOT)."""
         org = self.tree.get_org()
-        ent_ids = self.tree.get_ent_ids_by_activity(org.node_id, activity)
+        ent_ids = self._get_ent_ids(org.node_id, activity)
 
         return self._aggregate_emissions(
             node_id=org.node_id,
@@ -207,7 +315,7 @@ class EmissionCalculator:
     def _calculate_lot_activity(self, lot: TreeNode, activity: str,
                                overrides: EmissionOverrides, top_n: int) -> EmissionResult:
         """Calcule les émissions LOT × ACTIVITÉ."""
-        ent_ids = self.tree.get_ent_ids_by_activity(lot.node_id, activity)
+        ent_ids = self._get_ent_ids(lot.node_id, activity)
 
         return self._aggregate_emissions(
             node_id=lot.node_id,
@@ -244,46 +352,99 @@ class EmissionCalculator:
         if len(ent_ids) == 0:
             return result
 
-        # Filtrer les émissions pour ces ENT
-        mask = self.emissions_df['node_id'].isin(ent_ids)
-        emissions = self.emissions_df[mask].copy()
-
-        # Appliquer les overrides sur les postes
-        if overrides:
-            # Filtrer les postes à inclure dans les totaux
-            included_mask = emissions['poste_l1_code'].apply(
-                lambda code: overrides.is_poste_included(code)
-            )
-            emissions_for_totals = emissions[included_mask]
-        else:
-            emissions_for_totals = emissions
+        # Émissions [scope, poste] des ENT concernées, postes exclus des totaux mis à 0
+        nodes = self._node_indices(ent_ids)
+        included = self._included_postes(overrides)
+        by_scope_poste = self._emissions_by_node[nodes].sum(axis=0) * included
 
         # Calculer les totaux par scope
-        result.scope1_tco2e = emissions_for_totals[emissions_for_totals['scope'] == 1]['tco2e'].sum()
-        result.scope2_tco2e = emissions_for_totals[emissions_for_totals['scope'] == 2]['tco2e'].sum()
-        result.scope3_tco2e = emissions_for_totals[emissions_for_totals['scope'] == 3]['tco2e'].sum()
+        scope_sums = by_scope_poste.sum(axis=1)
+        result.scope1_tco2e, result.scope2_tco2e, result.scope3_tco2e = scope_sums[1:4].tolist()
         result.total_tco2e = result.scope1_tco2e + result.scope2_tco2e + result.scope3_tco2e
 
-        # Agréger par poste L1 (pour les postes inclus)
-        poste_groups = emissions_for_totals.groupby('poste_l1_code')['tco2e'].sum()
-        result.emissions_by_poste = poste_groups.to_dict()
-
-        # Calculer les top postes (triés par émissions décroissantes)
-        sorted_postes = sorted(result.emissions_by_poste.items(), key=lambda x: x[1], reverse=True)
-
-        # Filtrer les postes à afficher dans le rapport
-        if overrides:
-            sorted_postes = [(code, value) for code, value in sorted_postes
-                           if overrides.is_poste_shown(code)]
+        # Agréger par poste L1 (pour les postes inclus et présents pour ces ENT)
+        poste_sums = by_scope_poste[:, :-1].sum(axis=0)
+        present = (self._row_counts_by_node[nodes, :-1].sum(axis=0) > 0) & included[:-1]
+        result.emissions_by_poste = {
+            self._poste_uniques[i]: total
+            for i, total in zip(np.flatnonzero(present).tolist(), poste_sums[present].tolist())
+        }
 
-        # Filtrer les postes avec des émissions > 0
-        sorted_postes = [(code, value) for code, value in sorted_postes if value > 0]
+        # Calculer les top postes : postes affichés et non nuls, triés par émissions
+        # décroissantes (tri stable : à égalité, l'ordre des codes est conservé)
+        ranked = np.flatnonzero(present & (poste_sums > 0) & self._shown_postes(overrides))
+        ranked = ranked[np.argsort(-poste_sums[ranked], kind='stable')]
+        sorted_postes = [
+            (self._poste_uniques[i], total)
+            for i, total in zip(ranked.tolist(), poste_sums[ranked].tolist())
+        ]
 
         result.top_postes = sorted_postes[:top_n]
         result.other_postes = sorted_postes[top_n:]
 
         return result
 
+    def _get_ent_ids(self, parent_node_id: str, activity: str) -> List[str]:
+        """
+        IDs des ENT d'une activité sous un nœud, mémorisés par (nœud, activité).
+
+        Args:
+            parent_node_id: ID du nœud parent (ORG ou LOT)
+            activity: Activité (EU ou AEP)
+
+        Returns:
+            Liste des IDs d'ENT (partagée, ne pas modifier)
+        """
+        key = (parent_node_id, activity)
+        ent_ids = self._ent_ids_by_activity.get(key)
+        if ent_ids is None:
+            ent_ids = self.tree.get_ent_ids_by_activity(parent_node_id, activity)
+            self._ent_ids_by_activity[key] = ent_ids
+        return ent_ids
+
+    def _node_indices(self, ent_ids: List[str]) -> List[int]:
+        """
+        Indices dans le tenseur des ENT données (sans doublon, ENT sans émission ignorées).
+
+        Args:
+            ent_ids: Liste des IDs d'ENT
+
+        Returns:
+            Indices triés des ENT
+        """
+        return sorted({self._node_index[ent_id] for ent_id in ent_ids if ent_id in self._node_index})
+
+    def _included_postes(self, overrides: Optional[EmissionOverrides]) -> np.ndarray:
+        """
+        Masque des postes (colonnes du tenseur) inclus dans les totaux.
+
+        Args:
+            overrides: Overrides à appliquer (None = tout inclus)
+
+        Returns:
+            Tableau booléen, une case par poste + une pour les lignes sans poste
+        """
+        if not overrides or not overrides.poste_config:
+            return self._all_postes_with_missing
+        # Dernière case : lignes sans poste, toujours incluses
+        excluded = set(overrides.get_excluded_postes())
+        return np.array([code not in excluded for code in self._poste_uniques] + [True], dtype=bool)
+
+    def _shown_postes(self, overrides: Optional[EmissionOverrides]) -> np.ndarray:
+        """
+        Masque des postes à afficher dans le rapport.
+
+        Args:
+            overrides: Overrides à appliquer (None = tout affiché)
+
+        Returns:
+            Tableau booléen, une case par poste
+        """
+        if not overrides or not overrides.poste_config:
+            return self._all_postes_with_missing[:-1]
+        hidden = set(overrides.get_hidden_postes())
+        return np.array([code not in hidden for code in self._poste_uniques], dtype=bool)
+
     def get_poste_label(self, poste_l1_code: str) -> str:
         """Retourne le label d'un poste L1."""
         return self.poste_labels.get(poste_l1_code, poste_l1_code)
@@ -304,7 +465,7 @@ class EmissionCalculator:
         mask = (emissions_l2_df['node_id'].isin(ent_ids)) & \
                (emissions_l2_df['poste_l1_code'] == poste_l1_code)
 
-        l2_data = emissions_l2_df[mask].copy()
+        l2_data = emissions_l2_df[mask]
 
         if len(l2_data) == 0:
             return pd.DataFrame(columns=['poste_l2', 'tco2e'])
@@ -319,9 +480,7 @@ class EmissionCalculator:
         en INCLUANT le poste chauffage (exclu des calculs standards).
         Retourne None si aucune entité AEP.
         """
-        org = self.tree.get_org()
-        aep_ents = self.tree.get_ents_by_activity(org.node_id, 'AEP')
-        aep_ent_ids = [n.node_id for n in aep_ents]
+        aep_ent_ids = self._get_ent_ids(self.tree.get_org().node_id, 'AEP')
         if not aep_ent_ids:
             return None
         # Calcul sans overrides = tout inclus (y compris chauffage)
@@ -340,22 +499,17 @@ class EmissionCalculator:
         en INCLUANT le poste chauffage (potentiellement exclu par les overrides).
         Retourne None si aucune entité AEP (section inutile sans AEP).
         """
-        org = self.tree.get_org()
-        aep_ents = self.tree.get_ents_by_activity(org.node_id, 'AEP')
-        if not aep_ents:
+        if not self._get_ent_ids(self.tree.get_org().node_id, 'AEP'):
             return None
         # Calcul ORG sans overrides = tout inclus (y compris chauffage)
         return self._calculate_org(EmissionOverrides(), top_n)
 
     def get_chauffage_total(self, chauffage_poste_code: str = 'P_CHAUFFAGE_DE_L_EAU') -> float:
         """Retourne le total tCO2e du poste chauffage sur toutes les entités AEP."""
-        org = self.tree.get_org()
-        aep_ents = self.tree.get_ents_by_activity(org.node_id, 'AEP')
-        aep_ent_ids = [n.node_id for n in aep_ents]
+        aep_ent_ids = self._get_ent_ids(self.tree.get_org().node_id, 'AEP')
         if not aep_ent_ids:
             return 0.0
-        mask = (
-            self.emissions_df['node_id'].isin(aep_ent_ids)
-            & (self.emissions_df['poste_l1_code'] == chauffage_poste_code)
-        )
-        return self.emissions_df[mask]['tco2e'].sum()
+        if chauffage_poste_code not in self._poste_uniques:
+            return 0.0
+        poste = self._poste_uniques.index(chauffage_poste_code)
+        return float(self._emissions_by_node[self._node_indices(aep_ent_ids), :, poste].sum())
@@ -3,13 +3,34 @@ Module de calcul des indicateurs.
 Gère les indicateurs par LOT×ACTIVITÉ ou ORG×ACTIVITÉ.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from dataclasses import dataclass, field
 
 from .tree import OrganizationTree
 
 
+def _first_valid_by_group(values: pd.Series, codes: np.ndarray, n_groups: int) -> List[Optional[Any]]:
+    """
+    Première valeur non manquante de chaque groupe (équivalent d'un groupby 'first').
+
+    Args:
+        values: Colonne dont on veut la première valeur
+        codes: Code de groupe de chaque ligne (-1 = ligne hors groupe)
+        n_groups: Nombre de groupes
+
+    Returns:
+        Liste alignée sur les groupes, None si le groupe n'a aucune valeur
+    """
+    firsts: List[Optional[Any]] = [None] * n_groups
+    positions = np.flatnonzero(values.notna().to_numpy() & (codes >= 0))
+    groups, first_index = np.unique(codes[positions], return_index=True)
+    for group, value in zip(groups.tolist(), values.iloc[positions[first_index]]):
+        firsts[group] = value
+    return firsts
+
+
 @dataclass
 class IndicatorValue:
     """Valeur d'un indicateur."""
@@ -62,14 +83,51 @@ class IndicatorCalculator:
 
     def _prepare_references(self):
         """Prépare les dictionnaires de référence."""
-        self.indicator_info = {}
-        for _, row in self.indicators_ref_df.iterrows():
-            self.indicator_info[row['indicator_code']] = {
-                'label': row['indicator_label'],
-                'default_unit': row['default_unit'],
-                'activity_scope': row.get('activity_scope', None),
-                'display_order': row.get('display_order', 999)
+        ref = self.indicators_ref_df
+        n_rows = len(ref)
+
+        # Colonnes optionnelles : valeurs par défaut si absentes du référentiel
+        activity_scopes = ref['activity_scope'] if 'activity_scope' in ref else [None] * n_rows
+        display_orders = ref['display_order'] if 'display_order' in ref else [999] * n_rows
+
+        self.indicator_info = {
+            code: {
+                'label': label,
+                'default_unit': default_unit,
+                'activity_scope': activity_scope,
+                'display_order': display_order
             }
+            for code, label, default_unit, activity_scope, display_order in zip(
+                ref['indicator_code'], ref['indicator_label'], ref['default_unit'],
+                activity_scopes, display_orders
+            )
+        }
+
+        # Ordre d'affichage par code, pour trier les indicateurs sans repasser par indicator_info
+        self._display_order_by_code = dict(zip(ref['indicator_code'], display_orders))
+
+        # Positions des lignes d'INDICATORS par (node_id, activité), calculées une fois
+        self._rows_by_node_activity = self.indicators_df.groupby(['node_id', 'activity']).indices
+
+    def _get_indicator_rows(self, node_ids: List[str], activity: str) -> pd.DataFrame:
+        """
+        Récupère les lignes d'INDICATORS de plusieurs nœuds pour une activité.
+
+        Args:
+            node_ids: IDs des nœuds (ENT, LOT ou ORG)
+            activity: Activité (EU ou AEP)
+
+        Returns:
+            Lignes correspondantes, dans l'ordre du DataFrame
+        """
+        positions = [
+            self._rows_by_node_activity[(node_id, activity)]
+            for node_id in set(node_ids)
+            if (node_id, activity) in self._rows_by_node_activity
+        ]
+        if not positions:
+            return self.indicators_df.iloc[0:0]
+        return self.indicators_df.take(np.sort(np.concatenate(positions)))
 
     def calculate(self) -> Dict[str, IndicatorResult]:
         """
@@ -121,14 +179,10 @@ class IndicatorCalculator:
 
         if not ent_ids:
             # Fallback : chercher directement par LOT (si données au niveau LOT)
-            mask = (self.indicators_df['node_id'] == lot_id) & \
-                   (self.indicators_df['activity'] == activity)
-            lot_indicators = self.indicators_df[mask]
+            lot_indicators = self._get_indicator_rows([lot_id], activity)
         else:
             # Filtrer les indicateurs pour tous les ENT de ce LOT
-            mask = (self.indicators_df['node_id'].isin(ent_ids)) & \
-                   (self.indicators_df['activity'] == activity)
-            lot_indicators = self.indicators_df[mask]
+            lot_indicators = self._get_indicator_rows(ent_ids, activity)
 
         if len(lot_indicators) == 0:
             return None
@@ -141,25 +195,20 @@ class IndicatorCalculator:
 
         # Grouper par indicator_code et sommer les valeurs
         # (car plusieurs ENT peuvent contribuer au même indicateur)
-        grouped = lot_indicators.groupby('indicator_code').agg({
-            'value': 'sum',
-            'unit': 'first',  # Prendre la première unité (devrait être identique)
-            'comment': 'first'  # Prendre le premier commentaire
-        }).reset_index()
+        codes, indicator_codes = pd.factorize(lot_indicators['indicator_code'], sort=True)
+        n_codes = len(indicator_codes)
+        grouped = codes >= 0
+        values = lot_indicators['value'].to_numpy(dtype=np.float64)
+        values = np.where(np.isnan(values), 0.0, values)
+        sums = np.bincount(codes[grouped], weights=values[grouped], minlength=n_codes)
+
+        # Première unité (devrait être identique) et premier commentaire non vides
+        units = _first_valid_by_group(lot_indicators['unit'], codes, n_codes)
+        comments = _first_valid_by_group(lot_indicators['comment'], codes, n_codes)
 
         # Ajouter chaque indicateur
-        for _, row in grouped.iterrows():
-            indicator_code = row['indicator_code']
-            info = self.indicator_info.get(indicator_code, {})
-
-            indicator = IndicatorValue(
-                indicator_code=indicator_code,
-                indicator_label=info.get('label', indicator_code),
-                value=float(row['value']),
-                unit=row['unit'] if pd.notna(row['unit']) else info.get('default_unit', ''),
-                comment=row['comment'] if pd.notna(row['comment']) else None
-            )
-            result.add_indicator(indicator)
+        for indicator_code, value, unit, comment in zip(indicator_codes, sums.tolist(), units, comments):
+            result.add_indicator(self._make_indicator(indicator_code, value, unit, comment))
 
         return result
 
@@ -177,10 +226,7 @@ class IndicatorCalculator:
             IndicatorResult ou None si pas d'indicateurs
         """
         # Filtrer les indicateurs pour cette ORG et cette activité
-        mask = (self.indicators_df['node_id'] == org_id) & \
-               (self.indicators_df['activity'] == activity)
-
-        org_indicators = self.indicators_df[mask]
+        org_indicators = self._get_indicator_rows([org_id], activity)
 
         if len(org_indicators) == 0:
             return None
@@ -191,22 +237,41 @@ class IndicatorCalculator:
             activity=activity
         )
 
+        # Valeurs manquantes remplacées par None colonne par colonne
+        units = org_indicators['unit'].astype(object).where(org_indicators['unit'].notna(), None)
+        comments = org_indicators['comment'].astype(object).where(org_indicators['comment'].notna(), None)
+
         # Ajouter chaque indicateur
-        for _, row in org_indicators.iterrows():
-            indicator_code = row['indicator_code']
-            info = self.indicator_info.get(indicator_code, {})
-
-            indicator = IndicatorValue(
-                indicator_code=indicator_code,
-                indicator_label=info.get('label', indicator_code),
-                value=float(row['value']),
-                unit=row['unit'] if pd.notna(row['unit']) else info.get('default_unit', ''),
-                comment=row['comment'] if pd.notna(row['comment']) else None
-            )
-            result.add_indicator(indicator)
+        for indicator_code, value, unit, comment in zip(
+            org_indicators['indicator_code'], org_indicators['value'], units, comments
+        ):
+            result.add_indicator(self._make_indicator(indicator_code, value, unit, comment))
 
         return result
 
+    def _make_indicator(self, indicator_code: str, value: float,
+                        unit: Optional[str], comment: Optional[str]) -> IndicatorValue:
+        """
+        Construit un IndicatorValue en complétant label et unité depuis le référentiel.
+
+        Args:
+            indicator_code: Code de l'indicateur
+            value: Valeur de l'indicateur
+            unit: Unité saisie (None = unité par défaut du référentiel)
+            comment: Commentaire éventuel
+
+        Returns:
+            IndicatorValue
+        """
+        info = self.indicator_info.get(indicator_code, {})
+        return IndicatorValue(
+            indicator_code=indicator_code,
+            indicator_label=info.get('label', indicator_code),
+            value=float(value),
+            unit=unit if unit is not None else info.get('default_unit', ''),
+            comment=comment
+        )
+
     def get_sorted_indicators(self, result: IndicatorResult) -> List[IndicatorValue]:
         """
         Retourne les indicateurs triés par display_order.
@@ -217,11 +282,9 @@ class IndicatorCalculator:
         Returns:
             Liste d'IndicatorValue triés
         """
-        indicators = list(result.indicators.values())
-
-        # Trier par display_order
-        indicators.sort(key=lambda ind: self.indicator_info.get(
-            ind.indicator_code, {}
-        ).get('display_order', 999))
-
-        return indicators
+        # Trier par display_order (999 pour un code absent du référentiel)
+        order_by_code = self._display_order_by_code
+        return sorted(
+            result.indicators.values(),
+            key=lambda ind: order_by_code.get(ind.indicator_code, 999)
+        )
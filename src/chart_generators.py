@@ -3,18 +3,106 @@ Module de génération de graphiques avec Matplotlib.
 Supporte tous les CHART_KEY définis dans le brief.
 """
 
+import logging
 import matplotlib.pyplot as plt
 import matplotlib
 from matplotlib import font_manager as fm
+import matplotlib.patches as mpatches
+from matplotlib.collections import PatchCollection
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 matplotlib.use('Agg')  # Backend sans interface graphique
 import pandas as pd
 from io import BytesIO
-from typing import Optional, List
+from typing import Optional, List, Tuple
 import numpy as np
+from functools import lru_cache
 from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
 
 from .calc_emissions import EmissionResult
 
+logger = logging.getLogger(__name__)
+
+_FONT_DIR = Path(__file__).resolve().parent.parent / "assets" / "police"
+
+
+@lru_cache(maxsize=1)
+def _register_fonts() -> None:
+    """
+    Enregistre les polices Poppins auprès du fontManager, une seule fois par process.
+
+    Chaque addfont ajoute une entrée et vide le cache de recherche de polices :
+    le refaire à chaque ChartGenerator dupliquerait les entrées.
+    """
+    if _FONT_DIR.exists():
+        for font_path in _FONT_DIR.glob("*.ttf"):
+            try:
+                fm.fontManager.addfont(str(font_path))
+            except Exception:
+                pass
+
+
+@lru_cache(maxsize=1)
+def _shared_fonts() -> Tuple[fm.FontProperties, fm.FontProperties]:
+    """
+    Polices titre / corps partagées par tous les générateurs.
+
+    À appeler après le réglage des rcParams : FontProperties y lit la taille
+    et la police mathtext par défaut. Les Text matplotlib en font une copie.
+
+    Returns:
+        Tuple (police titre, police corps)
+    """
+    title_font = fm.FontProperties(family="Poppins", weight="bold", size=14)
+    body_font = fm.FontProperties(family="Poppins", weight="normal")
+    return title_font, body_font
+
+
+@lru_cache(maxsize=16)
+def _explode(n_slices: int) -> Tuple[float, ...]:
+    """Décalage uniforme des parts de camembert (tuple immuable partagé entre graphiques)."""
+    return (0.05,) * n_slices
+
+
+@lru_cache(maxsize=None)
+def _cell_font(weight: str, size: float) -> fm.FontProperties:
+    """
+    Police Poppins d'une cellule de tableau matplotlib, construite une fois par (graisse, taille).
+
+    Args:
+        weight: Graisse ('normal' ou 'bold')
+        size: Taille en points
+
+    Returns:
+        FontProperties partagée (les Text matplotlib en font une copie)
+    """
+    return fm.FontProperties(family="Poppins", weight=weight, size=size)
+
+
+@lru_cache(maxsize=None)
+def _table_font(weight: str, size_px: int) -> ImageFont.FreeTypeFont:
+    """
+    Police Poppins pour le rendu PIL des tableaux (fichier résolu par le fontManager).
+
+    Args:
+        weight: Graisse ('normal' ou 'bold')
+        size_px: Taille en pixels
+
+    Returns:
+        Police PIL chargée une seule fois par (graisse, taille)
+    """
+    _register_fonts()
+    font_props = fm.FontProperties(family="Poppins", weight=weight)
+    try:
+        font_path = fm.findfont(font_props, fallback_to_default=False)
+    except ValueError:
+        # Sans Poppins, findfont renverrait DejaVu sans le signaler
+        logger.warning("Police Poppins (%s) introuvable dans %s : tableaux rendus avec la police par défaut",
+                       weight, _FONT_DIR)
+        font_path = fm.findfont(font_props)
+    return ImageFont.truetype(font_path, size_px)
+
 
 class ChartGenerator:
     """Générateur de graphiques pour le rapport."""
@@ -27,12 +115,25 @@ class ChartGenerator:
     FIGSIZE_TABLE_WIDTH = 12.0  # Largeur du tableau BEGES (hauteur dynamique)
     DPI = 150
 
-    def __init__(self):
-        """Initialise le générateur avec les styles par défaut."""
+    # Compression PNG (zlib, défaut Pillow = 6). Les graphiques sont surtout des aplats :
+    # niveau 3 = encodage ~25 % plus rapide pour des fichiers ~20 % plus lourds.
+    # Les tableaux (grandes images, taille secondaire) passent au niveau 1.
+    PNG_COMPRESS_LEVEL = 3
+    PNG_COMPRESS_LEVEL_TABLE = 1
+
+    def __init__(self, dpi: Optional[int] = None):
+        """
+        Initialise le générateur avec les styles par défaut.
+
+        Args:
+            dpi: Résolution des PNG générés (DPI si None)
+        """
         # Style général
         plt.style.use('default')
         self.colors = ['#0B3B2E', '#3F9B83', '#62CC7B', '#8AD2C5', '#CDEFE8', '#E9F7F4']
-        self.dpi = self.DPI
+        self.dpi = dpi if dpi is not None else self.DPI
+        # Figures déjà créées, vidées et prêtes à être réutilisées
+        self._figure_pool: List[Figure] = []
         self._load_fonts()
         plt.rcParams["axes.grid"] = False
         plt.rcParams["axes.facecolor"] = "white"
@@ -43,6 +144,85 @@ class ChartGenerator:
             "fontsize": plt.rcParams.get("font.size", 10) + 1
         }
 
+    def _acquire_figure(self, figsize: Tuple[float, float],
+                        dpi: Optional[float] = None) -> Tuple[Figure, plt.Axes]:
+        """
+        Fournit une figure à un seul axe, réutilisée depuis le pool si possible.
+
+        Les figures sont créées hors de pyplot (pas d'enregistrement global) :
+        on évite de reconstruire figure, canvas Agg et état pyplot à chaque graphique.
+
+        Args:
+            figsize: Taille (largeur, hauteur) en inches
+            dpi: Résolution de la figure (défaut matplotlib si None)
+
+        Returns:
+            Tuple (figure, axe)
+        """
+        if dpi is None:
+            dpi = plt.rcParams['figure.dpi']
+        if self._figure_pool:
+            fig = self._figure_pool.pop()
+            fig.set_dpi(dpi)
+            fig.set_size_inches(figsize)
+        else:
+            fig = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(fig)
+        return fig, fig.add_subplot(111)
+
+    def _release_figure(self, fig: Figure):
+        """Vide la figure et la remet dans le pool."""
+        fig.clf(keep_observers=True)
+        self._figure_pool.append(fig)
+
+    def _save_png(self, fig: Figure, compress_level: Optional[int] = None,
+                  pad_inches: Optional[float] = None,
+                  bbox_inches: Optional[str] = 'tight') -> BytesIO:
+        """
+        Exporte la figure en PNG, recadré par défaut (bbox_inches='tight').
+
+        Args:
+            fig: Figure à exporter
+            compress_level: Niveau de compression zlib (PNG_COMPRESS_LEVEL si None)
+            pad_inches: Marge autour de la zone utile (savefig.pad_inches si None)
+            bbox_inches: 'tight' pour recadrer, None pour garder la taille de la figure
+
+        Returns:
+            Buffer PNG positionné au début
+        """
+        if compress_level is None:
+            compress_level = self.PNG_COMPRESS_LEVEL
+
+        # Pas de chunk tEXt « Software » : inutile dans une image embarquée dans le rapport
+        img_buffer = BytesIO()
+        fig.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches=bbox_inches,
+                    pad_inches=pad_inches, metadata={'Software': None},
+                    pil_kwargs={'compress_level': compress_level})
+        img_buffer.seek(0)
+        return img_buffer
+
+    def _top_postes_with_other(self, emissions_by_poste: dict, poste_labels: Optional[dict],
+                               top_n: int = 5) -> Tuple[List[str], List[float]]:
+        """
+        Postes par émissions décroissantes, au-delà de top_n regroupés dans « Autres ».
+
+        Args:
+            emissions_by_poste: Dictionnaire {code: tco2e}
+            poste_labels: Dictionnaire {code: label} (le code est affiché si absent)
+            top_n: Nombre de postes affichés individuellement
+
+        Returns:
+            Tuple (labels, valeurs)
+        """
+        sorted_postes = sorted(emissions_by_poste.items(), key=lambda x: x[1], reverse=True)
+        top = sorted_postes[:top_n]
+        labels = [poste_labels.get(code, code) if poste_labels else code for code, _ in top]
+        values = [value for _, value in top]
+        if len(sorted_postes) > top_n:
+            labels.append('Autres')
+            values.append(sum(v for _, v in sorted_postes[top_n:]))
+        return labels, values
+
     def _style_axes(self, ax):
         """Applique un style sans cadres ni axes."""
         ax.grid(False)
@@ -56,13 +236,7 @@ class ChartGenerator:
 
     def _load_fonts(self):
         """Charge les polices Poppins pour les graphiques."""
-        font_dir = Path(__file__).resolve().parent.parent / "assets" / "police"
-        if font_dir.exists():
-            for font_path in font_dir.glob("*.ttf"):
-                try:
-                    fm.fontManager.addfont(str(font_path))
-                except Exception:
-                    pass
+        _register_fonts()
 
         plt.rcParams["font.family"] = "Poppins"
         plt.rcParams["font.weight"] = "normal"
@@ -70,8 +244,7 @@ class ChartGenerator:
         plt.rcParams["mathtext.rm"] = "Poppins"
         plt.rcParams["mathtext.it"] = "Poppins:italic"
         plt.rcParams["mathtext.bf"] = "Poppins:bold"
-        self.title_font = fm.FontProperties(family="Poppins", weight="bold", size=14)
-        self.body_font = fm.FontProperties(family="Poppins", weight="normal")
+        self.title_font, self.body_font = _shared_fonts()
 
     def generate_chart(self, chart_key: str, data: pd.DataFrame,
                       **kwargs) -> Optional[BytesIO]:
@@ -125,7 +298,7 @@ class ChartGenerator:
         if data.empty:
             return None
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_BAR, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_BAR, self.dpi)
 
         # Bar chart horizontal
         y_pos = np.arange(len(data))
@@ -137,13 +310,11 @@ class ChartGenerator:
         self._style_axes(ax)
         ax.invert_yaxis()  # Plus gros en haut
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Sauvegarder dans BytesIO
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -160,11 +331,11 @@ class ChartGenerator:
         if data.empty:
             return None
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
 
         # Pie chart avec légende à droite et pourcentages à l'extérieur
         colors = ['#2E86AB', '#A23B72', '#F18F01']
-        explode = [0.05] * len(data)
+        explode = _explode(len(data))
         wedges, texts, autotexts = ax.pie(
             data['tco2e'],
             labels=None,  # Pas de labels sur le graphique, on utilise la légende
@@ -193,12 +364,10 @@ class ChartGenerator:
         ax.set_title('Répartition des émissions - File eau STEP', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -215,10 +384,10 @@ class ChartGenerator:
         if data.empty:
             return None
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
 
         # Pie chart (légende à droite, pas de labels autour du pie)
-        explode = [0.05] * len(data)
+        explode = _explode(len(data))
         wedges, texts, autotexts = ax.pie(
             data['tco2e'],
             labels=None,
@@ -239,12 +408,10 @@ class ChartGenerator:
         ax.set_title('Répartition des émissions indirectes', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -278,9 +445,9 @@ class ChartGenerator:
 
         pie_values = [all_values[i] for i in pie_indices]
         pie_colors = [scope_colors[i] for i in pie_indices]
-        explode = [0.05] * len(pie_values)
+        explode = _explode(len(pie_values))
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
         wedges, texts, autotexts = ax.pie(
             pie_values,
             labels=None,
@@ -294,7 +461,6 @@ class ChartGenerator:
             text.set_color("white")
 
         # Légende : inclure TOUS les scopes (même ceux à 0)
-        import matplotlib.patches as mpatches
         legend_handles = [
             mpatches.Patch(
                 color=scope_colors[i],
@@ -315,12 +481,10 @@ class ChartGenerator:
         ax.set_title(f'Répartition par scope - {org_name}', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -340,8 +504,8 @@ class ChartGenerator:
         names, values = zip(*lot_data)
 
         # Créer le pie chart avec les mêmes couleurs que les autres graphiques
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
-        explode = [0.05] * len(names)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
+        explode = _explode(len(names))
 
         wedges, texts, autotexts = ax.pie(
             values,
@@ -363,12 +527,10 @@ class ChartGenerator:
         ax.set_title('Contribution des lots du contrat', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -387,42 +549,20 @@ class ChartGenerator:
         if not emission_result.emissions_by_poste:
             return None
 
-        # Trier par valeur décroissante
-        sorted_postes = sorted(emission_result.emissions_by_poste.items(),
-                              key=lambda x: x[1], reverse=True)
-
         # Prendre top 5 + regrouper le reste
-        if len(sorted_postes) <= 5:
-            labels = []
-            values = []
-            for code, value in sorted_postes:
-                label = poste_labels.get(code, code) if poste_labels else code
-                labels.append(label)
-                values.append(value)
-        else:
-            labels = []
-            values = []
-            for code, value in sorted_postes[:5]:
-                label = poste_labels.get(code, code) if poste_labels else code
-                labels.append(label)
-                values.append(value)
-            # Regrouper le reste
-            labels.append('Autres')
-            values.append(sum(v for _, v in sorted_postes[5:]))
+        labels, values = self._top_postes_with_other(emission_result.emissions_by_poste, poste_labels)
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
-        explode = [0.05] * len(values)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
+        explode = _explode(len(values))
         ax.pie(values, labels=labels, autopct=self._pie_autopct,
                textprops=self._pie_textprops, colors=self.colors[:len(values)], startangle=90, explode=explode)
         ax.set_title("Contribution des postes sur l'ensemble du contrat", fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -447,20 +587,18 @@ class ChartGenerator:
         labels = list(filtered.keys())
         values = list(filtered.values())
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
         colors = ['#2E86AB', '#A23B72']
-        explode = [0.05] * len(values)
+        explode = _explode(len(values))
         ax.pie(values, labels=labels, autopct=self._pie_autopct,
                textprops=self._pie_textprops, colors=colors[:len(values)], startangle=90, explode=explode)
         ax.set_title('Répartition émissions Électricité par activité', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -485,19 +623,17 @@ class ChartGenerator:
         labels = list(filtered.keys())
         values = list(filtered.values())
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
-        explode = [0.05] * len(values)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
+        explode = _explode(len(values))
         ax.pie(values, labels=labels, autopct=self._pie_autopct,
                textprops=self._pie_textprops, colors=self.colors[:len(values)], startangle=90, explode=explode)
         ax.set_title('Répartition émissions Électricité par LOT', fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -526,30 +662,38 @@ class ChartGenerator:
         if not lots or not postes:
             return None
 
-        # Préparer les données pour chaque LOT
+        # Matrice des émissions [poste, LOT] (0 si le LOT n'a pas ce poste)
+        matrix = np.array([[top3_by_lot[poste].get(lot, 0) for lot in lots] for poste in postes],
+                          dtype=np.float64)
         x = np.arange(len(postes))
         width = 0.8 / len(lots)  # Largeur de chaque barre
+        offsets = width * np.arange(len(lots)) - (width * len(lots) / 2) + width / 2
+        # Écart des étiquettes au-dessus des barres : 2 % du max du LOT
+        col_max = matrix.max(axis=0)
+        label_gaps = np.where(col_max != 0, col_max * 0.02, 1.0)
+        # Étiquettes des barres (valeur arrondie, séparateur de milliers) et leur hauteur
+        label_y = (matrix + label_gaps).tolist()
+        label_texts = [[f"{int(round(value)):,}".replace(",", " ") for value in row]
+                       for row in matrix.tolist()]
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_GROUPED_BAR, dpi=self.dpi)
+        fig, ax = self._acquire_figure(self.FIGSIZE_GROUPED_BAR, self.dpi)
 
         # Tracer une barre pour chaque LOT
         lot_colors = self.colors[:max(1, len(lots))]
         for i, lot in enumerate(lots):
-            values = [top3_by_lot[poste].get(lot, 0) for poste in postes]
-            offset = width * i - (width * len(lots) / 2) + width / 2
-            bars = ax.bar(x + offset, values, width, label=lot,
-                          color=lot_colors[i % len(lot_colors)])
+            values = matrix[:, i]
+            color = lot_colors[i % len(lot_colors)]
+            ax.bar(x + offsets[i], values, width, label=lot, color=color)
 
-            for bar, value in zip(bars, values):
-                if value <= 0:
-                    continue
+            bar_x = (x + offsets[i]).tolist()
+            for k in np.flatnonzero(values > 0).tolist():
                 ax.text(
-                    bar.get_x() + bar.get_width() / 2,
-                    bar.get_height() + (max(values) * 0.02 if max(values) else 1),
-                    f"{int(round(value)):,}".replace(",", " "),
+                    bar_x[k],
+                    label_y[k][i],
+                    label_texts[k][i],
                     ha='center',
                     va='bottom',
-                    color=lot_colors[i % len(lot_colors)],
+                    color=color,
                     fontproperties=self.body_font
                 )
 
@@ -563,12 +707,10 @@ class ChartGenerator:
                   ncol=min(3, len(lots)), frameon=False)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -602,29 +744,10 @@ class ChartGenerator:
             return None
 
         # Prendre top 5 postes + regrouper le reste
-        sorted_postes = sorted(emission_result.emissions_by_poste.items(),
-                             key=lambda x: x[1], reverse=True)
-
-        if len(sorted_postes) <= 5:
-            labels = []
-            values = []
-            for code, value in sorted_postes:
-                label = poste_labels.get(code, code) if poste_labels else code
-                labels.append(label)
-                values.append(value)
-        else:
-            labels = []
-            values = []
-            for code, value in sorted_postes[:5]:
-                label = poste_labels.get(code, code) if poste_labels else code
-                labels.append(label)
-                values.append(value)
-            # Regrouper le reste
-            labels.append('Autres')
-            values.append(sum(v for _, v in sorted_postes[5:]))
+        labels, values = self._top_postes_with_other(emission_result.emissions_by_poste, poste_labels)
 
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_PIE, dpi=self.dpi)
-        explode = [0.05] * len(values)
+        fig, ax = self._acquire_figure(self.FIGSIZE_PIE, self.dpi)
+        explode = _explode(len(values))
         wedges, texts, autotexts = ax.pie(values, labels=labels, autopct=self._pie_autopct,
                textprops=self._pie_textprops, colors=self.colors[:len(values)], startangle=90, explode=explode)
         for autotext in autotexts:
@@ -633,12 +756,10 @@ class ChartGenerator:
         ax.set_title(title, fontproperties=self.title_font, pad=20)
         self._style_axes(ax)
 
-        plt.tight_layout()
+        fig.tight_layout()
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -656,23 +777,19 @@ class ChartGenerator:
             return None
 
         # Grouper et sommer par poste_l2
-        grouped = df.groupby('poste_l2', as_index=False)['tco2e'].sum()
-        grouped = grouped.sort_values('tco2e', ascending=False)
+        totals = df.groupby('poste_l2')['tco2e'].sum().sort_values(ascending=False)
 
         # Calculer les pourcentages
-        total = grouped['tco2e'].sum()
+        total = totals.sum()
         if total == 0:
             return None
 
-        grouped['percentage'] = (grouped['tco2e'] / total * 100).round(0).astype(int)
-
         # Préparer les données pour le graphique
-        labels = grouped['poste_l2'].tolist()
-        sizes = grouped['tco2e'].tolist()
-        percentages = grouped['percentage'].tolist()
+        labels = totals.index.tolist()
+        sizes = totals.tolist()
 
         # Créer la figure
-        fig, ax = plt.subplots(figsize=self.FIGSIZE_DONUT)
+        fig, ax = self._acquire_figure(self.FIGSIZE_DONUT)
 
         # Palette de couleurs (inspirée de l'image)
         colors = ['#1b4d3e', '#2d8b6b', '#f4c542', '#e8a87c']
@@ -681,7 +798,7 @@ class ChartGenerator:
             colors.append(f'#{hash(labels[len(colors)]) % 0xFFFFFF:06x}')
 
         # Créer le donut
-        explode = [0.05] * len(labels)
+        explode = _explode(len(labels))
         wedges, texts, autotexts = ax.pie(
             sizes,
             labels=None,  # Pas de labels sur le graphique
@@ -711,13 +828,11 @@ class ChartGenerator:
             frameon=False
         )
 
-        plt.tight_layout()
+        fig.tight_layout()
 
         # Sauvegarder dans un buffer
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight')
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig)
+        self._release_figure(fig)
 
         return img_buffer
 
@@ -738,9 +853,8 @@ class ChartGenerator:
             return None
 
         # Normaliser les noms de colonnes
-        df = beges_df.copy()
         col_map = {}
-        for col in df.columns:
+        for col in beges_df.columns:
             col_lower = col.strip().lower()
             if 'catégorie' in col_lower or 'categorie' in col_lower:
                 col_map[col] = 'categorie'
@@ -750,38 +864,37 @@ class ChartGenerator:
                 col_map[col] = 'poste'
             elif 'co2' in col_lower:
                 col_map[col] = 'co2'
-        df = df.rename(columns=col_map)
-
-        # Filtrer les lignes entièrement vides
-        rows = []
-        for _, row in df.iterrows():
-            cat = row.get('categorie', '')
-            num = str(row.get('numero', '')).strip()
-            poste = row.get('poste', '')
-            co2 = row.get('co2', None)
-
-            # Transformer NaN en chaîne vide
-            if pd.isna(cat):
-                cat = ''
-            if pd.isna(num) or num == 'nan':
-                num = ''
-            if pd.isna(poste):
-                poste = ''
-            if pd.isna(co2):
-                co2_str = ''
-            else:
-                co2_str = f"{co2:,.1f}".replace(',', ' ')
-
-            # Sauter les lignes complètement vides
-            if not cat and not num and not poste and not co2_str:
-                continue
+        df = beges_df.rename(columns=col_map)
 
-            rows.append({
-                'categorie': str(cat).strip(),
-                'numero': num,
-                'poste': str(poste).strip(),
-                'co2': co2_str,
-            })
+        # Transformer NaN en chaîne vide, colonne par colonne
+        missing = pd.Series(np.nan, index=df.index, dtype=object)
+        text = {
+            name: df.get(name, missing).map(str).where(df.get(name, missing).notna(), '')
+            for name in ('categorie', 'numero', 'poste')
+        }
+        co2 = df.get('co2', missing)
+        co2_str = co2.map(lambda v: f"{v:,.1f}".replace(',', ' '), na_action='ignore').where(co2.notna(), '')
+
+        # Sauter les lignes complètement vides
+        keep = ((text['categorie'] != '') | (text['numero'].str.strip() != '')
+                | (text['poste'] != '') | (co2_str != ''))
+        table = pd.DataFrame({
+            'categorie': text['categorie'].str.strip(),
+            'numero': text['numero'].str.strip(),
+            'poste': text['poste'].str.strip(),
+            'co2': co2_str,
+        })[keep]
+
+        # Style de chaque ligne : 4 = total, 3 = catégorie, 2 = sous-total,
+        # sinon 0/1 selon la parité de la ligne (lignes alternées)
+        numero = table['numero']
+        table['style'] = np.select(
+            [numero.str.upper() == 'TOTAL', table['categorie'] != '',
+             numero.str.lower().str.startswith('sous')],
+            [4, 3, 2],
+            default=np.arange(len(table)) % 2
+        )
+        rows = table.to_dict('records')
 
         if not rows:
             return None
@@ -797,18 +910,35 @@ class ChartGenerator:
         text_dark = '#1A1A1A'
         color_border = '#CCCCCC'
 
+        # Style par code de ligne : (fond, couleur du texte, graisse, taille)
+        row_styles = {
+            0: (color_row_even, text_dark, 'normal', 8),
+            1: (color_row_odd, text_dark, 'normal', 8),
+            2: (color_subtotal, text_dark, 'bold', 8.5),
+            3: (color_category, text_white, 'bold', 8.5),
+            4: (color_total, text_white, 'bold', 9),
+        }
+
         # Dimensions
         n_rows = len(rows) + 1  # +1 pour l'en-tête
         row_height = 0.45
         fig_height = n_rows * row_height + 1.0
         fig_width = self.FIGSIZE_TABLE_WIDTH
 
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=self.dpi)
-        ax.set_xlim(0, fig_width)
-        ax.set_ylim(0, n_rows)
-        ax.axis('off')
+        # Rendu direct avec PIL (aplats + textes, sans pipeline matplotlib).
+        # Même géométrie que le rendu figure : fig_width x fig_height inches dont
+        # les n_rows lignes occupent toute la hauteur, marge de 0.1 inch.
+        dpi = self.dpi
+        pad = round(0.1 * dpi)
+        table_width = round(fig_width * dpi)
+        table_height = round(fig_height * dpi)
+        row_px = table_height / n_rows
+        right = pad + table_width - 1
+
+        img = Image.new('RGB', (table_width + 2 * pad, table_height + 2 * pad), 'white')
+        draw = ImageDraw.Draw(img)
 
-        # Largeurs de colonnes (proportions)
+        # Largeurs de colonnes (inches)
         col_widths = [3.8, 1.0, 5.8, 1.4]  # categorie, numero, poste, co2
         col_starts = [0]
         for w in col_widths[:-1]:
@@ -817,74 +947,44 @@ class ChartGenerator:
         headers = ["Catégories d'émissions", "N°", "Postes d'émissions", "CO2 (t CO2e)"]
 
         # Dessiner l'en-tête
-        y = n_rows - 1
-        ax.add_patch(plt.Rectangle((0, y), fig_width, 1,
-                                    facecolor=color_header, edgecolor='none'))
+        top = pad
+        draw.rectangle([pad, top, right, round(top + row_px) - 1], fill=color_header)
+        header_font = _table_font('bold', round(9 * dpi / 72))
         for j, header in enumerate(headers):
-            ha = 'right' if j == 3 else 'left'
+            anchor = 'rm' if j == 3 else 'lm'
             x_pos = col_starts[j] + (col_widths[j] - 0.1 if j == 3 else 0.15)
-            ax.text(x_pos, y + 0.5, header, color=text_white,
-                    fontproperties=self.title_font, fontsize=9,
-                    ha=ha, va='center')
+            draw.text((pad + x_pos * dpi, top + row_px / 2), header, fill=text_white,
+                      font=header_font, anchor=anchor)
 
         # Dessiner les lignes de données
         for i, row_data in enumerate(rows):
-            y = n_rows - 2 - i
-            is_category = bool(row_data['categorie'])
-            is_subtotal = row_data['numero'].lower().startswith('sous')
-            is_total = row_data['numero'].upper() == 'TOTAL'
-
-            # Couleur de fond
-            if is_total:
-                bg_color = color_total
-                txt_color = text_white
-                font_weight = 'bold'
-                font_size = 9
-            elif is_category:
-                bg_color = color_category
-                txt_color = text_white
-                font_weight = 'bold'
-                font_size = 8.5
-            elif is_subtotal:
-                bg_color = color_subtotal
-                txt_color = text_dark
-                font_weight = 'bold'
-                font_size = 8.5
-            else:
-                bg_color = color_row_even if i % 2 == 0 else color_row_odd
-                txt_color = text_dark
-                font_weight = 'normal'
-                font_size = 8
+            top = pad + (i + 1) * row_px
+            bg_color, txt_color, font_weight, font_size = row_styles[row_data['style']]
 
             # Rectangle de fond
-            ax.add_patch(plt.Rectangle((0, y), fig_width, 1,
-                                        facecolor=bg_color, edgecolor=color_border,
-                                        linewidth=0.5))
+            draw.rectangle([pad, round(top), right, round(top + row_px) - 1],
+                           fill=bg_color, outline=color_border)
 
             # Texte de chaque colonne
+            font = _table_font(font_weight, round(font_size * dpi / 72))
             values = [row_data['categorie'], row_data['numero'],
                       row_data['poste'], row_data['co2']]
             for j, val in enumerate(values):
                 if not val:
                     continue
-                ha = 'right' if j == 3 else 'left'
+                anchor = 'rm' if j == 3 else 'lm'
                 x_pos = col_starts[j] + (col_widths[j] - 0.15 if j == 3 else 0.15)
-                fp = fm.FontProperties(family="Poppins", weight=font_weight, size=font_size)
-                ax.text(x_pos, y + 0.5, val, color=txt_color,
-                        fontproperties=fp, ha=ha, va='center')
+                draw.text((pad + x_pos * dpi, top + row_px / 2), val, fill=txt_color,
+                          font=font, anchor=anchor)
 
-        # Bordure extérieure
-        ax.add_patch(plt.Rectangle((0, 0), fig_width, n_rows,
-                                    facecolor='none', edgecolor=color_header,
-                                    linewidth=1.5))
-
-        plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        # Bordure extérieure (1.5 pt)
+        draw.rectangle([pad, pad, right, pad + table_height - 1],
+                       outline=color_header, width=round(1.5 * dpi / 72))
 
         img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight',
-                    pad_inches=0.1)
+        img.save(img_buffer, format='PNG', dpi=(dpi, dpi),
+                 compress_level=self.PNG_COMPRESS_LEVEL_TABLE, optimize=False)
         img_buffer.seek(0)
-        plt.close(fig)
 
         return img_buffer
 
@@ -903,25 +1003,19 @@ class ChartGenerator:
         if evitees_df is None or evitees_df.empty:
             return None
 
-        # Agréger par typologie
-        grouped = evitees_df.groupby('typologie', sort=False)['tco2e'].sum().reset_index()
-        grouped = grouped.sort_values('tco2e', ascending=False)
+        # Agréger par typologie (les typologies vides sont écartées par le groupby)
+        totals = evitees_df.groupby('typologie', sort=False)['tco2e'].sum().sort_values(ascending=False)
 
-        if grouped.empty:
+        if totals.empty:
             return None
 
-        total = grouped['tco2e'].sum()
+        total = totals.sum()
 
         # Préparer les lignes : données + total
-        rows = []
-        for _, row in grouped.iterrows():
-            typ = str(row['typologie']).strip() if pd.notna(row['typologie']) else ''
-            tco2e_val = row['tco2e']
-            rows.append({
-                'typologie': typ,
-                'tco2e': f"{tco2e_val:,.1f}".replace(',', ' '),
-                'is_total': False,
-            })
+        rows = [
+            {'typologie': str(typ).strip(), 'tco2e': f"{val:,.1f}".replace(',', ' '), 'is_total': False}
+            for typ, val in totals.items()
+        ]
         rows.append({
             'typologie': 'Total émissions évitées',
             'tco2e': f"{total:,.1f}".replace(',', ' '),
@@ -943,7 +1037,10 @@ class ChartGenerator:
         fig_height = n_rows * row_height + 1.0
         fig_width = 8.0  # Plus étroit que BEGES (2 colonnes seulement)
 
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=self.dpi)
+        # La figure a directement sa taille finale (tableau + marge) : pas de
+        # recadrage bbox_inches='tight', qui coûte un second rendu complet
+        margin = 0.1
+        fig, ax = self._acquire_figure((fig_width + 2 * margin, fig_height + 2 * margin), self.dpi)
         ax.set_xlim(0, fig_width)
         ax.set_ylim(0, n_rows)
         ax.axis('off')
@@ -954,10 +1051,13 @@ class ChartGenerator:
 
         headers = ["Typologie", "tCO₂e évitées"]
 
+        # Fonds de l'en-tête et des lignes, dessinés en une seule collection
+        backgrounds = []
+
         # Dessiner l'en-tête
         y = n_rows - 1
-        ax.add_patch(plt.Rectangle((0, y), fig_width, 1,
-                                    facecolor=color_header, edgecolor='none'))
+        backgrounds.append(plt.Rectangle((0, y), fig_width, 1,
+                                         facecolor=color_header, edgecolor='none'))
         for j, header in enumerate(headers):
             ha = 'right' if j == 1 else 'left'
             x_pos = col_starts[j] + (col_widths[j] - 0.15 if j == 1 else 0.15)
@@ -980,9 +1080,9 @@ class ChartGenerator:
                 font_weight = 'normal'
                 font_size = 8.5
 
-            ax.add_patch(plt.Rectangle((0, y), fig_width, 1,
-                                        facecolor=bg_color, edgecolor=color_border,
-                                        linewidth=0.5))
+            backgrounds.append(plt.Rectangle((0, y), fig_width, 1,
+                                             facecolor=bg_color, edgecolor=color_border,
+                                             linewidth=0.5))
 
             values = [row_data['typologie'], row_data['tco2e']]
             for j, val in enumerate(values):
@@ -990,21 +1090,22 @@ class ChartGenerator:
                     continue
                 ha = 'right' if j == 1 else 'left'
                 x_pos = col_starts[j] + (col_widths[j] - 0.15 if j == 1 else 0.15)
-                fp = fm.FontProperties(family="Poppins", weight=font_weight, size=font_size)
                 ax.text(x_pos, y + 0.5, val, color=txt_color,
-                        fontproperties=fp, ha=ha, va='center')
+                        fontproperties=_cell_font(font_weight, font_size), ha=ha, va='center')
+
+        ax.add_collection(PatchCollection(backgrounds, match_original=True))
 
         # Bordure extérieure
         ax.add_patch(plt.Rectangle((0, 0), fig_width, n_rows,
                                     facecolor='none', edgecolor=color_header,
                                     linewidth=1.5))
 
-        plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        fig.subplots_adjust(left=margin / (fig_width + 2 * margin),
+                            right=1 - margin / (fig_width + 2 * margin),
+                            bottom=margin / (fig_height + 2 * margin),
+                            top=1 - margin / (fig_height + 2 * margin))
 
-        img_buffer = BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=self.dpi, bbox_inches='tight',
-                    pad_inches=0.1)
-        img_buffer.seek(0)
-        plt.close(fig)
+        img_buffer = self._save_png(fig, self.PNG_COMPRESS_LEVEL_TABLE, bbox_inches=None)
+        self._release_figure(fig)
 
         return img_buffer
@@ -34,6 +34,12 @@ class PosteContent:
         return self.activity == target_activity
 
 
+def _optional_key(series: pd.Series) -> pd.Series:
+    """Remplace les valeurs manquantes ou vides d'une colonne par None."""
+    present = series.notna() & series.astype(str).str.strip().ne('')
+    return series.astype(object).where(present, None)
+
+
 class ContentCatalog:
     """
     Catalogue des contenus de rapport pour chaque poste L1.
@@ -71,30 +77,32 @@ class ContentCatalog:
         # Dictionnaire : {poste_l1_code: [PosteContent]}
         self.catalog: Dict[str, List[PosteContent]] = {}
 
-        for _, row in self.texte_rapport_df.iterrows():
-            poste_code = row['poste_l1_code']
-
-            # Nettoyer les valeurs None/NaN
-            chart_key = row['CHART_KEY'] if pd.notna(row['CHART_KEY']) and row['CHART_KEY'].strip() else None
-            image_key = row['IMAGE_KEY'] if pd.notna(row['IMAGE_KEY']) and row['IMAGE_KEY'].strip() else None
-            table_key = row['TABLE_KEY'] if pd.notna(row['TABLE_KEY']) and row['TABLE_KEY'].strip() else None
-            icone = row['icone'] if pd.notna(row['icone']) and row['icone'].strip() else None
-            activity = row['activity'] if pd.notna(row['activity']) else 'BOTH'
-
+        df = self.texte_rapport_df
+
+        # Nettoyer les valeurs None/NaN colonne par colonne plutôt que ligne à ligne
+        value = df['value']
+        activity = df['activity']
+        columns = zip(
+            df['poste_l1_code'],
+            value.astype(str).where(value.notna(), ''),
+            _optional_key(df['icone']),
+            _optional_key(df['CHART_KEY']),
+            _optional_key(df['IMAGE_KEY']),
+            _optional_key(df['TABLE_KEY']),
+            activity.astype(object).where(activity.notna(), 'BOTH'),
+        )
+
+        for poste_code, text, icone, chart_key, image_key, table_key, act in columns:
             content = PosteContent(
                 poste_l1_code=poste_code,
-                text=str(row['value']) if pd.notna(row['value']) else '',
+                text=text,
                 icone=icone,
                 chart_key=chart_key,
                 image_key=image_key,
                 table_key=table_key,
-                activity=activity
+                activity=act
             )
-
-            if poste_code not in self.catalog:
-                self.catalog[poste_code] = []
-
-            self.catalog[poste_code].append(content)
+            self.catalog.setdefault(poste_code, []).append(content)
 
     def get_content(self, poste_l1_code: str, activity: str) -> Optional[PosteContent]:
         """
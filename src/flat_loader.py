@@ -6,9 +6,20 @@ Transforme le tableau plat en 9 DataFrames compatibles avec le format standard d
 import re
 import unicodedata
 import pandas as pd
-from typing import Dict, List, Optional, Tuple, Set
+from typing import BinaryIO, Dict, List, Optional, Tuple, Set, Union
 from pathlib import Path
 
+from .calc_emissions import EmissionOverrides
+
+# Moteur de lecture Excel : calamine (Rust, bien plus rapide) s'il est installé,
+# sinon openpyxl (moteur par défaut de pandas)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = 'openpyxl'
+
+
 class ExcelValidationError(Exception):
     """Exception levée lors d'erreurs de validation du fichier Excel."""
     pass
@@ -30,6 +41,12 @@ REQUIRED_SHEETS = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Onglets lus dans le classeur source (BEGES est optionnel)
+# ---------------------------------------------------------------------------
+SOURCE_SHEETS = ['DATA', 'TEXTE_RAPPORT', 'BEGES']
+
+
 # ---------------------------------------------------------------------------
 # Colonnes attendues dans l'onglet DATA
 # ---------------------------------------------------------------------------
@@ -119,11 +136,14 @@ CHAUFFAGE_POSTE_CODE = "P_CHAUFFAGE_DE_L_EAU"
 # Helpers
 # ---------------------------------------------------------------------------
 
+_SLUG_SEP_RE = re.compile(r'[^a-zA-Z0-9]+')
+
+
 def _slugify(text: str) -> str:
     """Normalise un texte en slug : supprime accents, remplace espaces/tirets par _, majuscules."""
     normalized = unicodedata.normalize('NFD', text)
     ascii_text = normalized.encode('ascii', 'ignore').decode('ascii')
-    slug = re.sub(r'[^a-zA-Z0-9]+', '_', ascii_text).strip('_').upper()
+    slug = _SLUG_SEP_RE.sub('_', ascii_text).strip('_').upper()
     return slug
 
 
@@ -151,6 +171,17 @@ def _make_indicator_code(indicator_name: str) -> str:
     return f'IND_{_slugify(indicator_name)}'
 
 
+def _map_unique(series: pd.Series, func) -> pd.Series:
+    """Applique func une seule fois par valeur distincte puis diffuse le résultat."""
+    mapping = {value: func(value) for value in series.unique()}
+    return series.map(mapping)
+
+
+def _make_node_ids_ent(rows: pd.DataFrame) -> pd.Series:
+    """Version vectorisée de _make_node_id_ent sur les colonnes Lot/Entité."""
+    return 'ENT_' + _map_unique(rows['Lot'], _slugify) + '_' + rows['Entité'].astype(str)
+
+
 # ---------------------------------------------------------------------------
 # FlatLoader
 # ---------------------------------------------------------------------------
@@ -161,19 +192,26 @@ class FlatLoader:
     et produit le même Dict[str, pd.DataFrame] que ExcelLoader.load().
     """
 
-    def __init__(self, file_path: str):
-        self.file_path = Path(file_path)
+    def __init__(self, file_path: Union[str, Path, BinaryIO]):
+        """
+        Args:
+            file_path: Chemin du fichier Excel, ou flux binaire déjà en mémoire
+                (ex: BytesIO d'un fichier uploadé), lu sans passer par le disque
+        """
+        if isinstance(file_path, (str, Path)):
+            file_path = Path(file_path)
+        self.file_path = file_path
         self.data: Dict[str, pd.DataFrame] = {}
         self.validation_errors: List[str] = []
         self.validation_warnings: List[str] = []
 
     def load(self) -> Dict[str, pd.DataFrame]:
         """Charge et transforme le fichier Excel simplifié en 9 DataFrames standard."""
-        if not self.file_path.exists():
+        if isinstance(self.file_path, Path) and not self.file_path.exists():
             raise ExcelValidationError(f"Fichier non trouvé : {self.file_path}")
 
         try:
-            excel_file = pd.ExcelFile(self.file_path)
+            excel_file = pd.ExcelFile(self.file_path, engine=EXCEL_ENGINE)
 
             # 1. Valider les onglets
             self._validate_sheets(excel_file.sheet_names)
@@ -182,8 +220,11 @@ class FlatLoader:
                     "Erreurs de validation :\n" + "\n".join(self.validation_errors)
                 )
 
-            # 2. Lire et valider DATA
-            data_df = pd.read_excel(excel_file, sheet_name='DATA')
+            # 2. Lire les onglets utiles en un seul appel (les autres onglets
+            #    du classeur ne sont pas parsés), puis valider DATA
+            sheet_names = [name for name in SOURCE_SHEETS if name in excel_file.sheet_names]
+            sheets = pd.read_excel(excel_file, sheet_name=sheet_names)
+            data_df = sheets['DATA']
             self._validate_flat_columns(data_df)
             if self.validation_errors:
                 raise ExcelValidationError(
@@ -209,12 +250,12 @@ class FlatLoader:
             # 6. TEXTE_RAPPORT : lecture directe + mapping codes
             emission_categories = set(emission_rows['Catégorie'].dropna().unique())
             self.data['TEXTE_RAPPORT'] = self._build_texte_rapport(
-                excel_file, emission_categories
+                sheets['TEXTE_RAPPORT'], emission_categories
             )
 
-            # 7. Charger BEGES si présent
-            if 'BEGES' in excel_file.sheet_names:
-                self.data['BEGES'] = pd.read_excel(excel_file, sheet_name='BEGES')
+            # 7. BEGES si présent
+            if 'BEGES' in sheets:
+                self.data['BEGES'] = sheets['BEGES']
 
             # 8. Validation finale des schemas
             self._validate_output_schemas()
@@ -240,7 +281,6 @@ class FlatLoader:
 
         Doit être appelé après load().
         """
-        from src.calc_emissions import EmissionOverrides
         overrides = EmissionOverrides()
         if 'EMISSIONS' not in self.data:
             return overrides
@@ -318,9 +358,11 @@ class FlatLoader:
         )
         emission_mask = ~indicator_mask & ~evitees_mask
 
-        emission_rows = df[emission_mask].copy()
-        indicator_rows = df[indicator_mask].copy()
-        evitees_rows = df[evitees_mask].copy()
+        # Pas de copie : les builders ne modifient pas ces sélections
+        # (_build_emissions et _build_emissions_l2 copient avant d'ajouter des colonnes)
+        emission_rows = df[emission_mask]
+        indicator_rows = df[indicator_mask]
+        evitees_rows = df[evitees_mask]
 
         # Warnings pour catégories d'émission inconnues
         if len(emission_rows) > 0:
@@ -389,11 +431,9 @@ class FlatLoader:
             return pd.DataFrame(columns=['node_id', 'scope', 'poste_l1_code', 'tco2e', 'comment'])
 
         df = emission_rows.copy()
-        df['node_id'] = df.apply(
-            lambda r: _make_node_id_ent(r['Lot'], r['Entité']), axis=1
-        )
+        df['node_id'] = _make_node_ids_ent(df)
         df['scope'] = df['Catégorie'].map(SCOPE_BY_CATEGORY).fillna(3).astype(int)
-        df['poste_l1_code'] = df['Catégorie'].apply(_make_poste_code)
+        df['poste_l1_code'] = _map_unique(df['Catégorie'], _make_poste_code)
         df['tco2e'] = df['Emissions_kgCO2'] / 1000.0
 
         # Agréger les sous-postes L2 au niveau L1
@@ -401,6 +441,7 @@ class FlatLoader:
             ['node_id', 'scope', 'poste_l1_code'], as_index=False
         ).agg({'tco2e': 'sum'})
         aggregated['comment'] = ''
+        aggregated['poste_l1_code'] = aggregated['poste_l1_code'].astype('category')
 
         return aggregated[['node_id', 'scope', 'poste_l1_code', 'tco2e', 'comment']]
 
@@ -410,10 +451,8 @@ class FlatLoader:
             return pd.DataFrame(columns=['node_id', 'poste_l1_code', 'poste_l2', 'tco2e'])
 
         df = emission_rows.copy()
-        df['node_id'] = df.apply(
-            lambda r: _make_node_id_ent(r['Lot'], r['Entité']), axis=1
-        )
-        df['poste_l1_code'] = df['Catégorie'].apply(_make_poste_code)
+        df['node_id'] = _make_node_ids_ent(df)
+        df['poste_l1_code'] = _map_unique(df['Catégorie'], _make_poste_code)
         df['poste_l2'] = df['Poste']
         df['tco2e'] = df['Emissions_kgCO2'] / 1000.0
 
@@ -421,6 +460,7 @@ class FlatLoader:
         aggregated = df.groupby(
             ['node_id', 'poste_l1_code', 'poste_l2'], as_index=False
         ).agg({'tco2e': 'sum'})
+        aggregated['poste_l1_code'] = aggregated['poste_l1_code'].astype('category')
 
         return aggregated[['node_id', 'poste_l1_code', 'poste_l2', 'tco2e']]
 
@@ -465,25 +505,16 @@ class FlatLoader:
             return pd.DataFrame(columns=['node_id', 'activity', 'indicator_code',
                                          'value', 'unit', 'comment'])
 
-        rows = []
-        for _, row in indicator_rows.iterrows():
-            indicator_name = row['Poste']
-            if pd.isna(indicator_name) or indicator_name is None:
-                continue
+        rows = indicator_rows[indicator_rows['Poste'].notna()]
 
-            code = _make_indicator_code(indicator_name)
-            node_id = _make_node_id_ent(row['Lot'], row['Entité'])
-
-            rows.append({
-                'node_id': node_id,
-                'activity': row['Entité'],
-                'indicator_code': code,
-                'value': row['Quantité'],
-                'unit': row['Unité'] if pd.notna(row.get('Unité')) else '',
-                'comment': ''
-            })
-
-        return pd.DataFrame(rows)
+        return pd.DataFrame({
+            'node_id': _make_node_ids_ent(rows),
+            'activity': rows['Entité'],
+            'indicator_code': _map_unique(rows['Poste'], _make_indicator_code),
+            'value': rows['Quantité'],
+            'unit': rows['Unité'].fillna(''),
+            'comment': '',
+        }).reset_index(drop=True)
 
     def _build_indicators_ref(self, indicator_rows: pd.DataFrame) -> pd.DataFrame:
         """Construit INDICATORS_REF : une entrée par indicateur unique."""
@@ -491,51 +522,33 @@ class FlatLoader:
             return pd.DataFrame(columns=['indicator_code', 'indicator_label',
                                          'default_unit', 'activity_scope', 'display_order'])
 
-        rows = []
-        seen: Set[str] = set()
-        order = 0
-
-        for _, row in indicator_rows.iterrows():
-            indicator_name = row['Poste']
-            if pd.isna(indicator_name) or indicator_name is None:
-                continue
+        rows = indicator_rows[indicator_rows['Poste'].notna()]
 
-            code = _make_indicator_code(indicator_name)
-            if code in seen:
-                continue
-            seen.add(code)
-            order += 1
+        # Première occurrence de chaque code, dans l'ordre du fichier
+        df = pd.DataFrame({
+            'indicator_code': _map_unique(rows['Poste'], _make_indicator_code),
+            'indicator_label': rows['Poste'],
+            'default_unit': rows['Unité'].fillna(''),
+            'activity_scope': 'BOTH',
+        }).drop_duplicates(subset='indicator_code').reset_index(drop=True)
+        df['display_order'] = range(1, len(df) + 1)
 
-            rows.append({
-                'indicator_code': code,
-                'indicator_label': indicator_name,
-                'default_unit': row['Unité'] if pd.notna(row.get('Unité')) else '',
-                'activity_scope': 'BOTH',
-                'display_order': order
-            })
-
-        return pd.DataFrame(rows)
+        return df
 
     def _build_emissions_evitees(self, evitees_rows: pd.DataFrame) -> pd.DataFrame:
         """Construit EMISSIONS_EVITEES depuis les lignes Émissions évitées."""
         if len(evitees_rows) == 0:
             return pd.DataFrame(columns=['node_id', 'typologie', 'tco2e'])
 
-        rows = []
-        for _, row in evitees_rows.iterrows():
-            node_id = _make_node_id_ent(row['Lot'], row['Entité'])
-            rows.append({
-                'node_id': node_id,
-                'typologie': row['Poste'] if pd.notna(row.get('Poste')) else '',
-                'tco2e': row['Emissions_kgCO2'] / 1000.0
-            })
-
-        return pd.DataFrame(rows)
+        return pd.DataFrame({
+            'node_id': _make_node_ids_ent(evitees_rows),
+            'typologie': evitees_rows['Poste'].fillna(''),
+            'tco2e': evitees_rows['Emissions_kgCO2'] / 1000.0,
+        }).reset_index(drop=True)
 
-    def _build_texte_rapport(self, excel_file: pd.ExcelFile,
+    def _build_texte_rapport(self, df: pd.DataFrame,
                              emission_categories: Set[str]) -> pd.DataFrame:
-        """Lit TEXTE_RAPPORT et transforme poste_l1_code si nécessaire."""
-        df = pd.read_excel(excel_file, sheet_name='TEXTE_RAPPORT')
+        """Transforme poste_l1_code de TEXTE_RAPPORT si nécessaire."""
 
         # Si les poste_l1_code dans TEXTE_RAPPORT correspondent aux noms de catégorie
         # bruts du pipeline, les convertir en codes générés
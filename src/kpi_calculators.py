@@ -15,6 +15,12 @@ class KPICalculator:
     CO2_PER_FLIGHT_PARIS_NY = 1.75  # tCO2e par vol Paris-New York
     CO2_PER_PERSON_YEAR_FR = 9.0  # tCO2e/an/personne en France
 
+    # Indicateur de volume de référence pour les KPI m³ de chaque activité
+    VOLUME_CODE_BY_ACTIVITY = {
+        'EU': 'VOL_EAU_EPURE',     # eau épurée
+        'AEP': 'VOL_EAU_DISTRIB',  # eau distribuée
+    }
+
     def __init__(self):
         """Initialise le calculateur."""
         pass
@@ -82,15 +88,16 @@ class KPICalculator:
                 total_volume += indicator.value
         return total_volume
 
-    def calculate_kpi_m3_eu(self, emission_result: EmissionResult,
-                            indicator_results: List[IndicatorResult]) -> Optional[float]:
+    def calculate_kpi_m3(self, activity: str, emission_result: EmissionResult,
+                         indicator_results: List[IndicatorResult]) -> Optional[float]:
         """
-        Calcule le KPI EU : kgCO2e/m³ eau épurée.
-        Somme TOUS les volumes EU de tous les périmètres.
+        Calcule le KPI kgCO2e/m³ d'une activité (eau épurée pour EU, distribuée pour AEP).
+        Somme TOUS les volumes de l'activité sur tous les périmètres.
 
         Args:
-            emission_result: Résultat d'émissions EU (total)
-            indicator_results: Liste de TOUS les résultats d'indicateurs EU
+            activity: Activité (EU ou AEP)
+            emission_result: Résultat d'émissions de l'activité (total)
+            indicator_results: Liste de TOUS les résultats d'indicateurs de l'activité
 
         Returns:
             KPI en kgCO2e/m³ ou None si pas de données
@@ -98,8 +105,9 @@ class KPICalculator:
         if not indicator_results:
             return None
 
-        # Sommer TOUS les volumes d'eau épurée
-        total_volume_m3 = self.sum_volumes_by_activity(indicator_results, 'VOL_EAU_EPURE')
+        total_volume_m3 = self.sum_volumes_by_activity(
+            indicator_results, self.VOLUME_CODE_BY_ACTIVITY[activity]
+        )
 
         if total_volume_m3 == 0:
             return None
@@ -108,31 +116,15 @@ class KPICalculator:
         kg_co2e = emission_result.total_tco2e * 1000
         return kg_co2e / total_volume_m3
 
+    def calculate_kpi_m3_eu(self, emission_result: EmissionResult,
+                            indicator_results: List[IndicatorResult]) -> Optional[float]:
+        """Calcule le KPI EU : kgCO2e/m³ eau épurée (voir calculate_kpi_m3)."""
+        return self.calculate_kpi_m3('EU', emission_result, indicator_results)
+
     def calculate_kpi_m3_aep(self, emission_result: EmissionResult,
                              indicator_results: List[IndicatorResult]) -> Optional[float]:
-        """
-        Calcule le KPI AEP : kgCO2e/m³ eau distribuée.
-        Somme TOUS les volumes AEP de tous les périmètres.
-
-        Args:
-            emission_result: Résultat d'émissions AEP (total)
-            indicator_results: Liste de TOUS les résultats d'indicateurs AEP
-
-        Returns:
-            KPI en kgCO2e/m³ ou None si pas de données
-        """
-        if not indicator_results:
-            return None
-
-        # Sommer TOUS les volumes d'eau distribuée
-        total_volume_m3 = self.sum_volumes_by_activity(indicator_results, 'VOL_EAU_DISTRIB')
-
-        if total_volume_m3 == 0:
-            return None
-
-        # Convertir tCO2e en kgCO2e
-        kg_co2e = emission_result.total_tco2e * 1000
-        return kg_co2e / total_volume_m3
+        """Calcule le KPI AEP : kgCO2e/m³ eau distribuée (voir calculate_kpi_m3)."""
+        return self.calculate_kpi_m3('AEP', emission_result, indicator_results)
 
     def generate_activity_volume_comparison_text(self,
                                                  eu_result: Optional[EmissionResult],
@@ -217,7 +209,7 @@ class KPICalculator:
             return None
 
         # Sélectionner le bon indicateur de volume selon l'activité
-        volume_code = 'VOL_EAU_EPURE' if activity == 'EU' else 'VOL_EAU_DISTRIB'
+        volume_code = self.VOLUME_CODE_BY_ACTIVITY.get(activity, 'VOL_EAU_DISTRIB')
         volume_indicator = indicator_result.get_indicator(volume_code)
 
         if not volume_indicator or volume_indicator.value == 0:
@@ -7,6 +7,8 @@ import pandas as pd
 from docx.table import Table
 from docx.shared import Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
 from typing import Optional, List
 
 
@@ -96,9 +98,6 @@ class TableGenerator:
 
     def _get_or_create_shading(self, cell):
         """Récupère ou crée l'élément shading pour une cellule."""
-        from docx.oxml import parse_xml
-        from docx.oxml.ns import nsdecls
-
         tc = cell._element
         tcPr = tc.get_or_add_tcPr()
         shading = tcPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}shd')
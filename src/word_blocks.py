@@ -5,6 +5,7 @@ Gère la duplication de blocs [[START_XXX]] ... [[END_XXX]].
 
 import re
 from docx.document import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
 from copy import deepcopy
 from typing import List, Tuple, Optional
 
@@ -156,8 +157,6 @@ class BlockProcessor:
             end_idx: Index de fin du bloc (basé sur les paragraphes)
             replacements: Dictionnaire {placeholder: valeur}
         """
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
-
         paragraphs = list(self.doc.paragraphs)
 
         # 1. Remplacer dans les paragraphes
@@ -9,7 +9,7 @@ from docx import Document
 from docx.shared import Inches
 from docx.oxml import parse_xml
 from docx.oxml.ns import nsdecls
-from typing import Dict, List, Optional, Any, Tuple
+from typing import BinaryIO, Dict, List, Optional, Any, Tuple, Union
 from pathlib import Path
 from io import BytesIO
 
@@ -19,6 +19,11 @@ from .chart_generators import ChartGenerator
 from .table_generators import TableGenerator
 from .kpi_calculators import KPICalculator
 from .content_catalog import ContentCatalog
+from .word_blocks import BlockProcessor
+
+
+# Paragraphe réduit à un placeholder non remplacé, ex: {{NOM_ORGA}}
+_PLACEHOLDER_RE = re.compile(r'^\{\{[A-Z_0-9]+\}\}$')
 
 
 class WordRenderer:
@@ -31,17 +36,21 @@ class WordRenderer:
     IMAGE_WIDTH_CHART = 5.0       # Graphiques standard (pie, bar, etc.)
     IMAGE_WIDTH_FULL = 6.5        # Tableaux pleine largeur (BEGES, etc.)
 
-    def __init__(self, template_path: str, assets_path: str):
+    def __init__(self, template_path: Union[str, Path, BinaryIO], assets_path: str):
         """
         Initialise le renderer.
 
         Args:
-            template_path: Chemin vers le template Word
+            template_path: Chemin vers le template Word, ou flux binaire déjà en mémoire
             assets_path: Chemin vers le dossier assets
         """
-        self.template_path = Path(template_path)
+        if isinstance(template_path, (str, Path)):
+            template_path = Path(template_path)
+        self.template_path = template_path
         self.assets_path = Path(assets_path)
         self.doc = None
+        self._template_bytes: Optional[bytes] = None
+        self._template_text: Optional[str] = None
 
         # Générateurs
         self.chart_gen = ChartGenerator()
@@ -49,10 +58,40 @@ class WordRenderer:
         self.kpi_calc = KPICalculator()
 
     def load_template(self):
-        """Charge le template Word."""
-        if not self.template_path.exists():
-            raise FileNotFoundError(f"Template non trouvé : {self.template_path}")
-        self.doc = Document(self.template_path)
+        """
+        Charge le template Word.
+
+        Le fichier n'est lu qu'une fois ; chaque appel produit ensuite un
+        nouveau document à partir des octets gardés en mémoire, ce qui permet
+        de réutiliser le même renderer pour plusieurs rendus.
+        """
+        if self._template_bytes is None:
+            if isinstance(self.template_path, Path):
+                if not self.template_path.exists():
+                    raise FileNotFoundError(f"Template non trouvé : {self.template_path}")
+                self._template_bytes = self.template_path.read_bytes()
+            else:
+                self._template_bytes = self.template_path.read()
+        self.doc = Document(BytesIO(self._template_bytes))
+
+    def has_block(self, start_marker: str) -> bool:
+        """
+        Indique si le template contient un marqueur de bloc, sans effectuer le rendu.
+
+        Permet de ne calculer les données d'une section que si le template
+        l'utilise. Le texte du template n'est extrait qu'une fois.
+
+        Args:
+            start_marker: Marqueur de début (ex: '[[START_CHAUFFAGE_INCLUS]]')
+
+        Returns:
+            True si le marqueur est présent dans un paragraphe du corps
+        """
+        if self._template_text is None:
+            self.load_template()
+            self._template_text = "\n".join(p.text for p in self.doc.paragraphs)
+            self.doc = None
+        return start_marker in self._template_text
 
     def render(self, context: Dict[str, Any]) -> Document:
         """
@@ -409,8 +448,6 @@ class WordRenderer:
         Args:
             context: Contexte global
         """
-        from .word_blocks import BlockProcessor
-
         has_lots = context.get('has_lots', False)
         tree = context.get('tree')
 
@@ -469,8 +506,6 @@ class WordRenderer:
         Args:
             context: Contexte global
         """
-        from .word_blocks import BlockProcessor
-
         # Dans ce cas, les blocs ACTIVITY sont au niveau racine
         # On cherche les blocs ACTIVITY dans tout le document
         processor = BlockProcessor(self.doc)
@@ -783,8 +818,6 @@ class WordRenderer:
             activity: Activité (EU ou AEP)
             context: Contexte global
         """
-        from .word_blocks import BlockProcessor
-
         # Récupérer les données
         lot_results = context.get('lot_results', {})
         result = lot_results.get(entity_key)
@@ -967,8 +1000,6 @@ class WordRenderer:
             {{CHAUFFAGE_PERCENTAGE}} — % du chauffage par rapport au total AEP
             {{PIE_CHART_CHAUFFAGE_INCLU}} — camembert ORG chauffage inclus
         """
-        from .word_blocks import BlockProcessor
-
         processor = BlockProcessor(self.doc)
         block_info = processor.find_block('[[START_CHAUFFAGE_INCLUS]]', '[[END_CHAUFFAGE_INCLUS]]')
 
@@ -1014,8 +1045,6 @@ class WordRenderer:
         Affiche les émissions évitées sous forme de tableau.
         Si aucune donnée, le bloc est supprimé.
         """
-        from .word_blocks import BlockProcessor
-
         processor = BlockProcessor(self.doc)
         block_info = processor.find_block('[[START_EVITEES]]', '[[END_EVITEES]]')
 
@@ -1109,8 +1138,6 @@ class WordRenderer:
             parent_node_id: ID du nœud parent (ex: 'STEP1' pour LOT, 'ORG' pour ORG)
             context: Contexte global
         """
-        from .word_blocks import BlockProcessor
-
         tree = context.get('tree')
         lot_results = context.get('lot_results', {})
         has_lots = context.get('has_lots', False)
@@ -1304,8 +1331,6 @@ class WordRenderer:
             activity: Activité (EU ou AEP)
             context: Contexte global
         """
-        from .word_blocks import BlockProcessor
-
         # Récupérer les données
         lot_results = context.get('lot_results', {})
         result = lot_results.get(entity_key)
@@ -1385,8 +1410,6 @@ class WordRenderer:
 
     def _clean_all_markers(self):
         """Nettoie tous les marqueurs de blocs du document."""
-        from .word_blocks import BlockProcessor
-
         processor = BlockProcessor(self.doc)
 
         # Nettoyer dans l'ordre inverse (imbrication)
@@ -1654,7 +1677,7 @@ class WordRenderer:
         for paragraph in self.doc.paragraphs:
             text = paragraph.text.strip()
             # Si le paragraphe contient uniquement un placeholder {{...}}
-            if re.match(r'^\{\{[A-Z_0-9]+\}\}$', text):
+            if _PLACEHOLDER_RE.match(text):
                 paragraphs_to_remove.append(paragraph)
 
         # Supprimer les paragraphes
@@ -1683,3 +1706,26 @@ class WordRenderer:
             raise ValueError("Document non chargé. Appelez render() d'abord.")
 
         self.doc.save(output_path)
+
+    def to_bytes(self) -> bytes:
+        """
+        Sérialise le document rendu en mémoire, sans passer par le disque.
+
+        Returns:
+            Contenu du fichier .docx
+        """
+        if self.doc is None:
+            raise ValueError("Document non chargé. Appelez render() d'abord.")
+
+        buffer = BytesIO()
+        self.doc.save(buffer)
+        return buffer.getvalue()
+
+    def release(self):
+        """
+        Libère le document rendu.
+
+        Le template reste en mémoire : un renderer mis en cache ne garde ainsi
+        pas le dernier rapport entre deux générations.
+        """
+        self.doc = None
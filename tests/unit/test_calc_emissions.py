@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour calc_emissions.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Ajouter le dossier racine au path (2 niveaux au-dessus car on est dans tests/unit/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.tree import OrganizationTree
+from src.calc_emissions import EmissionCalculator, EmissionOverrides, EmissionResult
+
+
+def _build_calculator() -> EmissionCalculator:
+    """Construit un calculateur sur une arborescence ORG -> 2 LOT -> ENT EU/AEP."""
+    tree_df = pd.DataFrame([
+        {"node_id": "ORG1", "parent_id": None, "node_type": "ORG", "node_name": "ORG", "activity": None},
+        {"node_id": "LOT1", "parent_id": "ORG1", "node_type": "LOT", "node_name": "Lot A", "activity": None},
+        {"node_id": "LOT2", "parent_id": "ORG1", "node_type": "LOT", "node_name": "Lot B", "activity": None},
+        {"node_id": "ENT1", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 1", "activity": "EU"},
+        {"node_id": "ENT2", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 2", "activity": "AEP"},
+        {"node_id": "ENT3", "parent_id": "LOT2", "node_type": "ENT", "node_name": "Ent 3", "activity": "EU"},
+        # ENT sans aucune ligne d'émission
+        {"node_id": "ENT4", "parent_id": "LOT2", "node_type": "ENT", "node_name": "Ent 4", "activity": "AEP"},
+    ])
+    emissions_df = pd.DataFrame([
+        {"node_id": "ENT1", "scope": 2, "poste_l1_code": "P_ENERGIE", "tco2e": 10.0, "comment": ""},
+        {"node_id": "ENT1", "scope": 3, "poste_l1_code": "P_TRAVAUX", "tco2e": 5.0, "comment": ""},
+        {"node_id": "ENT2", "scope": 1, "poste_l1_code": "P_FRET_SORTANT", "tco2e": 2.0, "comment": ""},
+        {"node_id": "ENT2", "scope": 3, "poste_l1_code": "P_CHAUFFAGE_DE_L_EAU", "tco2e": 7.0, "comment": ""},
+        {"node_id": "ENT3", "scope": 3, "poste_l1_code": "P_TRAVAUX", "tco2e": 1.5, "comment": ""},
+        # Émissions d'une ENT absente de l'arborescence : ignorées partout
+        {"node_id": "ENT_INCONNUE", "scope": 1, "poste_l1_code": "P_ENERGIE", "tco2e": 100.0, "comment": ""},
+    ])
+    postes_ref_df = pd.DataFrame([
+        {"poste_l1_code": "P_ENERGIE", "poste_l1_label": "Electricité", "commentaire": ""},
+        {"poste_l1_code": "P_TRAVAUX", "poste_l1_label": "Intrants - Travaux", "commentaire": ""},
+        {"poste_l1_code": "P_FRET_SORTANT", "poste_l1_label": "Fret sortant", "commentaire": ""},
+        {"poste_l1_code": "P_CHAUFFAGE_DE_L_EAU", "poste_l1_label": "Chauffage", "commentaire": ""},
+    ])
+    return EmissionCalculator(OrganizationTree(tree_df), emissions_df, postes_ref_df)
+
+
+def test_aggregate_sums_scopes():
+    """L'agrégat d'une activité somme totaux et scopes de ses LOT."""
+    results = _build_calculator().calculate_brut()
+    eu_results = [r for r in results.values() if r.activity == "EU"]
+    aggregated = EmissionResult.aggregate(eu_results, node_id="ORG", activity="EU")
+
+    assert aggregated.node_name == "ORG" and aggregated.activity == "EU"
+    assert (aggregated.total_tco2e, aggregated.scope1_tco2e,
+            aggregated.scope2_tco2e, aggregated.scope3_tco2e) == (16.5, 0.0, 10.0, 6.5)
+    assert aggregated.top_postes == [] and aggregated.emissions_by_poste == {}
+    assert EmissionResult.aggregate([], node_id="ORG", activity="AEP").total_tco2e == 0.0
+
+
+def test_calculate_net_repeated_renamed_and_reconfigured():
+    """Appels répétés identiques ; renommage et changement de configuration bien répercutés."""
+    calc = _build_calculator()
+    overrides = EmissionOverrides()
+    overrides.set_poste_config("P_CHAUFFAGE_DE_L_EAU", show_in_report=False, include_in_totals=False)
+
+    first = calc.calculate_net(overrides)
+    assert calc.calculate_net(overrides) == first
+    assert first["LOT_LOT1_AEP"].total_tco2e == 2.0
+
+    overrides.node_renames["LOT1"] = "Lot renommé"
+    renamed = calc.calculate_net(overrides)
+    assert renamed["LOT_LOT1_AEP"].node_name == "Lot renommé"
+    assert renamed["LOT_LOT1_AEP"].total_tco2e == 2.0
+    assert first["LOT_LOT1_AEP"].node_name == "Lot A"
+
+    # Poste réintégré : nouveau calcul, identique au BRUT (hors renommage)
+    overrides.set_poste_config("P_CHAUFFAGE_DE_L_EAU", show_in_report=True, include_in_totals=True)
+    reconfigured = calc.calculate_net(overrides)
+    assert reconfigured["LOT_LOT1_AEP"].total_tco2e == 9.0
+    assert reconfigured["LOT_LOT1_AEP"].node_name == "Lot renommé"
+    brut = calc.calculate_brut()
+    assert reconfigured["ORG"] == brut["ORG"]
+    assert first["LOT_LOT1_AEP"].total_tco2e == 2.0
+
+
+def test_calculate_missing_ent_and_hidden_poste():
+    """ENT sans émission ou hors arborescence, poste masqué mais inclus, classement des postes."""
+    calc = _build_calculator()
+
+    brut = calc.calculate_brut(top_n=2)
+    empty = brut["LOT_LOT2_AEP"]
+    assert isinstance(empty.total_tco2e, float) and empty.total_tco2e == 0.0
+    assert empty.emissions_by_poste == {} and empty.top_postes == []
+
+    org = brut["ORG"]
+    assert org.total_tco2e == 25.5
+    assert org.top_postes == [("P_ENERGIE", 10.0), ("P_CHAUFFAGE_DE_L_EAU", 7.0)]
+    assert org.other_postes == [("P_TRAVAUX", 6.5), ("P_FRET_SORTANT", 2.0)]
+
+    # Poste masqué : compté dans les totaux, absent du classement
+    overrides = EmissionOverrides()
+    overrides.set_poste_config("P_ENERGIE", show_in_report=False, include_in_totals=True)
+    org = calc.calculate_net(overrides, top_n=2)["ORG"]
+    assert org.total_tco2e == 25.5 and org.scope2_tco2e == 10.0
+    assert org.emissions_by_poste["P_ENERGIE"] == 10.0
+    assert org.top_postes == [("P_CHAUFFAGE_DE_L_EAU", 7.0), ("P_TRAVAUX", 6.5)]
+    assert org.other_postes == [("P_FRET_SORTANT", 2.0)]
+
+    # Poste exclu des totaux : retiré des totaux et des postes
+    overrides.set_poste_config("P_ENERGIE", show_in_report=True, include_in_totals=False)
+    org = calc.calculate_net(overrides, top_n=2)["ORG"]
+    assert org.total_tco2e == 15.5 and org.scope2_tco2e == 0.0
+    assert "P_ENERGIE" not in org.emissions_by_poste
+
+
+def main():
+    """Exécute tous les tests."""
+    print("=" * 70)
+    print("🧪 TESTS UNITAIRES - EmissionCalculator")
+    print("=" * 70)
+    print()
+
+    tests = [
+        ("Agrégat par activité", test_aggregate_sums_scopes),
+        ("Appels répétés, renommage et configuration", test_calculate_net_repeated_renamed_and_reconfigured),
+        ("ENT sans émission et poste masqué", test_calculate_missing_ent_and_hidden_poste),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        print(f"🔍 Test: {test_name}")
+        try:
+            test_func()
+            passed += 1
+            print()
+        except Exception as e:
+            failed += 1
+            print(f"❌ Test échoué avec erreur: {test_name}")
+            print(f"   Erreur: {e!r}")
+            print()
+
+    print("=" * 70)
+    print(f"📊 Résultats: {passed} réussis, {failed} échoués")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour calc_indicators.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le dossier racine au path (2 niveaux au-dessus car on est dans tests/unit/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.tree import OrganizationTree
+from src.calc_indicators import IndicatorCalculator
+
+
+def _build_calculator() -> IndicatorCalculator:
+    """Construit un calculateur sur un LOT à deux ENT EU qui partagent des indicateurs."""
+    tree_df = pd.DataFrame([
+        {"node_id": "ORG1", "parent_id": None, "node_type": "ORG", "node_name": "ORG", "activity": None},
+        {"node_id": "LOT1", "parent_id": "ORG1", "node_type": "LOT", "node_name": "Lot A", "activity": None},
+        {"node_id": "ENT1", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 1", "activity": "EU"},
+        {"node_id": "ENT2", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 2", "activity": "EU"},
+    ])
+    indicators_df = pd.DataFrame([
+        {"node_id": "ENT1", "activity": "EU", "indicator_code": "VOL_EAU_EPURE", "value": 100.0, "unit": None, "comment": None},
+        {"node_id": "ENT2", "activity": "EU", "indicator_code": "VOL_EAU_EPURE", "value": 50.0, "unit": "m3", "comment": "estimé"},
+        {"node_id": "ENT1", "activity": "EU", "indicator_code": "NB_BRANCHEMENTS", "value": np.nan, "unit": None, "comment": None},
+        {"node_id": "ENT2", "activity": "EU", "indicator_code": "NB_BRANCHEMENTS", "value": 12.0, "unit": None, "comment": None},
+        {"node_id": "ENT2", "activity": "AEP", "indicator_code": "VOL_EAU_DISTRIB", "value": 999.0, "unit": "m3", "comment": None},
+    ])
+    indicators_ref_df = pd.DataFrame([
+        {"indicator_code": "VOL_EAU_EPURE", "indicator_label": "m3 d'eau assainis", "default_unit": "m3"},
+        {"indicator_code": "NB_BRANCHEMENTS", "indicator_label": "Nombre de branchements", "default_unit": "unités"},
+    ])
+    return IndicatorCalculator(OrganizationTree(tree_df), indicators_df, indicators_ref_df)
+
+
+def test_lot_indicators_sum_and_first_values():
+    """Les ENT d'un LOT sont sommées ; unité et commentaire = première valeur renseignée."""
+    results = _build_calculator().calculate()
+
+    assert list(results) == ["LOT_LOT1_EU"]
+    indicators = results["LOT_LOT1_EU"].indicators
+    assert list(indicators) == ["NB_BRANCHEMENTS", "VOL_EAU_EPURE"]
+
+    volume = indicators["VOL_EAU_EPURE"]
+    assert (volume.value, volume.unit, volume.comment) == (150.0, "m3", "estimé")
+    assert volume.indicator_label == "m3 d'eau assainis"
+
+    branchements = indicators["NB_BRANCHEMENTS"]
+    assert (branchements.value, branchements.unit, branchements.comment) == (12.0, "unités", None)
+
+
+def test_lot_indicators_missing_values():
+    """NaN ignorés dans les sommes ; unité/commentaire = première valeur non manquante du LOT."""
+    tree_df = pd.DataFrame([
+        {"node_id": "ORG1", "parent_id": None, "node_type": "ORG", "node_name": "ORG", "activity": None},
+        {"node_id": "LOT1", "parent_id": "ORG1", "node_type": "LOT", "node_name": "Lot A", "activity": None},
+        {"node_id": "ENT1", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 1", "activity": "AEP"},
+        {"node_id": "ENT2", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 2", "activity": "AEP"},
+        {"node_id": "ENT3", "parent_id": "LOT1", "node_type": "ENT", "node_name": "Ent 3", "activity": "AEP"},
+    ])
+    indicators_df = pd.DataFrame([
+        {"node_id": "ENT1", "activity": "AEP", "indicator_code": "VOL_EAU_DISTRIB", "value": 10.0, "unit": np.nan, "comment": np.nan},
+        {"node_id": "ENT2", "activity": "AEP", "indicator_code": "VOL_EAU_DISTRIB", "value": np.nan, "unit": np.nan, "comment": "relevé"},
+        {"node_id": "ENT3", "activity": "AEP", "indicator_code": "VOL_EAU_DISTRIB", "value": 5.5, "unit": "m3", "comment": "estimé"},
+        {"node_id": "ENT1", "activity": "AEP", "indicator_code": "NB_USINES", "value": np.nan, "unit": np.nan, "comment": np.nan},
+        {"node_id": "ENT2", "activity": "AEP", "indicator_code": "NB_USINES", "value": np.nan, "unit": np.nan, "comment": np.nan},
+    ])
+    indicators_ref_df = pd.DataFrame([
+        {"indicator_code": "VOL_EAU_DISTRIB", "indicator_label": "m3 d'eau distribués", "default_unit": "m3 (réf.)"},
+    ])
+    results = IndicatorCalculator(OrganizationTree(tree_df), indicators_df, indicators_ref_df).calculate()
+
+    indicators = results["LOT_LOT1_AEP"].indicators
+    assert list(indicators) == ["NB_USINES", "VOL_EAU_DISTRIB"]
+
+    volume = indicators["VOL_EAU_DISTRIB"]
+    assert (volume.value, volume.unit, volume.comment) == (15.5, "m3", "relevé")
+
+    # Indicateur sans aucune valeur renseignée, absent du référentiel
+    usines = indicators["NB_USINES"]
+    assert (usines.value, usines.unit, usines.comment) == (0.0, "", None)
+    assert usines.indicator_label == "NB_USINES"
+
+
+def main():
+    """Exécute tous les tests."""
+    print("=" * 70)
+    print("🧪 TESTS UNITAIRES - IndicatorCalculator")
+    print("=" * 70)
+    print()
+
+    tests = [
+        ("Indicateurs LOT : somme et premières valeurs", test_lot_indicators_sum_and_first_values),
+        ("Indicateurs LOT : valeurs manquantes", test_lot_indicators_missing_values),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        print(f"🔍 Test: {test_name}")
+        try:
+            test_func()
+            passed += 1
+            print()
+        except Exception as e:
+            failed += 1
+            print(f"❌ Test échoué avec erreur: {test_name}")
+            print(f"   Erreur: {e!r}")
+            print()
+
+    print("=" * 70)
+    print(f"📊 Résultats: {passed} réussis, {failed} échoués")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour chart_generators.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import pandas as pd
+from PIL import Image
+
+# Ajouter le dossier racine au path (2 niveaux au-dessus car on est dans tests/unit/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src import chart_generators
+from src.chart_generators import ChartGenerator, _table_font
+
+
+def _beges_df() -> pd.DataFrame:
+    """Feuille BEGES minimale : une catégorie, un poste, un sous-total et le total."""
+    return pd.DataFrame({
+        "Catégorie": ["1. Émissions directes", None, None, None],
+        "Numéro": [None, "1.1", "Sous total", "Total"],
+        "Poste": [None, "Sources fixes", None, None],
+        "CO2 (t)": [None, 12.5, 12.5, 12.5],
+    })
+
+
+def test_beges_table_image_size():
+    """Le tableau BEGES a une taille fixe pour un contenu et une résolution donnés."""
+    img_buffer = ChartGenerator().generate_beges_table_image(_beges_df())
+    image = Image.open(img_buffer)
+
+    # 12 in x 150 dpi + 2 marges de 0.1 in ; 5 lignes (en-tête compris)
+    assert image.size == (1830, 518)
+    assert round(image.info["dpi"][0]) == ChartGenerator.DPI
+
+
+def test_chart_png_has_no_software_metadata():
+    """Les PNG exportés par savefig ne portent pas de chunk « Software »."""
+    data = pd.DataFrame({"poste_l2": ["Béton", "Acier"], "tco2e": [3.0, 1.5]})
+    image = Image.open(ChartGenerator().generate_travaux_breakdown(data))
+
+    assert "Software" not in image.info
+    assert round(image.info["dpi"][0]) == ChartGenerator.DPI
+
+
+def test_table_font_is_poppins():
+    """Les tableaux PIL utilisent bien les fichiers Poppins fournis dans assets/police."""
+    assert _table_font("bold", 20).getname() == ("Poppins", "Bold")
+    assert _table_font("normal", 20).getname() == ("Poppins", "Regular")
+
+
+def test_table_font_missing_is_reported():
+    """Sans Poppins, le repli sur la police par défaut est signalé dans les logs."""
+    findfont = chart_generators.fm.findfont
+
+    def findfont_without_poppins(prop, fallback_to_default=True, **kwargs):
+        if not fallback_to_default:
+            raise ValueError("Poppins absente")
+        return findfont(prop, **kwargs)
+
+    _table_font.cache_clear()
+    chart_generators.fm.findfont = findfont_without_poppins
+    try:
+        with unittest.TestCase().assertLogs(chart_generators.logger, level="WARNING") as logs:
+            _table_font("bold", 20)
+    finally:
+        chart_generators.fm.findfont = findfont
+        _table_font.cache_clear()
+
+    assert len(logs.output) == 1 and "Poppins (bold) introuvable" in logs.output[0]
+
+
+def main():
+    """Exécute tous les tests."""
+    print("=" * 70)
+    print("🧪 TESTS UNITAIRES - ChartGenerator")
+    print("=" * 70)
+    print()
+
+    tests = [
+        ("Taille du tableau BEGES", test_beges_table_image_size),
+        ("PNG sans métadonnée Software", test_chart_png_has_no_software_metadata),
+        ("Police Poppins des tableaux", test_table_font_is_poppins),
+        ("Police Poppins absente", test_table_font_missing_is_reported),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        print(f"🔍 Test: {test_name}")
+        try:
+            test_func()
+            passed += 1
+            print()
+        except Exception as e:
+            failed += 1
+            print(f"❌ Test échoué avec erreur: {test_name}")
+            print(f"   Erreur: {e!r}")
+            print()
+
+    print("=" * 70)
+    print(f"📊 Résultats: {passed} réussis, {failed} échoués")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
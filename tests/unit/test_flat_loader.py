@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests unitaires pour flat_loader.
+"""
+
+import sys
+from io import BytesIO
+from pathlib import Path
+
+# Ajouter le dossier racine au path (2 niveaux au-dessus car on est dans tests/unit/)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.flat_loader import FlatLoader
+
+SAMPLE_XLSX = Path(__file__).parent.parent / "results_tests.xlsm"
+
+
+def test_load_from_stream_matches_path():
+    """Un flux en mémoire produit les mêmes DataFrames qu'un chemin disque."""
+    from_path = FlatLoader(str(SAMPLE_XLSX)).load()
+    from_stream = FlatLoader(BytesIO(SAMPLE_XLSX.read_bytes())).load()
+
+    assert from_path.keys() == from_stream.keys()
+    for name, df in from_path.items():
+        assert df.equals(from_stream[name]), name
+
+
+def main():
+    """Exécute tous les tests."""
+    print("=" * 70)
+    print("🧪 TESTS UNITAIRES - FlatLoader")
+    print("=" * 70)
+    print()
+
+    tests = [
+        ("Chargement depuis un flux mémoire", test_load_from_stream_matches_path),
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test_name, test_func in tests:
+        print(f"🔍 Test: {test_name}")
+        try:
+            test_func()
+            passed += 1
+            print()
+        except Exception as e:
+            failed += 1
+            print(f"❌ Test échoué avec erreur: {test_name}")
+            print(f"   Erreur: {e!r}")
+            print()
+
+    print("=" * 70)
+    print(f"📊 Résultats: {passed} réussis, {failed} échoués")
+    print("=" * 70)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
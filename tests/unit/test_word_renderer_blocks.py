@@ -6,6 +6,7 @@ Tests de l'insertion du logo et des blocs répétables.
 
 import sys
 import tempfile
+from io import BytesIO
 from pathlib import Path
 
 import pandas as pd
@@ -172,6 +173,51 @@ def test_repetition_lot_activity_blocks():
         return True
 
 
+def test_render_twice_from_memory():
+    """Teste qu'un renderer chargé depuis un flux peut être réutilisé et sérialisé en mémoire."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_path = Path(tmp_dir) / "template_test.docx"
+        _build_minimal_template(template_path)
+
+        tree = _build_test_tree()
+        context = {
+            "annee": 2024,
+            "lot_results": {},
+            "has_lots": True,
+            "tree": tree,
+        }
+
+        renderer = WordRenderer(BytesIO(template_path.read_bytes()), "assets")
+        texts = []
+        for _ in range(2):
+            renderer.render(context)
+            doc = Document(BytesIO(renderer.to_bytes()))
+            texts.append(_collect_doc_text(doc))
+            renderer.release()
+            assert renderer.doc is None, "Le document rendu n'a pas été libéré"
+
+        assert texts[0] == texts[1], "Le second rendu diffère du premier"
+        assert texts[0].count("Lot A") == 1, "Le template partagé a été modifié"
+
+        print("✅ Rendu répété depuis la mémoire OK")
+        return True
+
+
+def test_has_block_scans_template_once():
+    """Teste la détection des marqueurs de bloc sans rendu du document."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        template_path = Path(tmp_dir) / "template_test.docx"
+        _build_minimal_template(template_path)
+
+        renderer = WordRenderer(template_path, "assets")
+        assert renderer.has_block("[[START_LOT]]")
+        assert not renderer.has_block("[[START_CHAUFFAGE_INCLUS]]")
+        assert renderer.doc is None, "La détection ne doit pas garder de document chargé"
+
+        print("✅ Détection des blocs du template OK")
+        return True
+
+
 def main():
     """Exécute tous les tests."""
     print("=" * 70)
@@ -184,6 +230,8 @@ def main():
         ("Méthode d'insertion du logo", test_logo_insertion_method_exists),
         ("Méthodes de traitement des blocs", test_block_processing_methods_exist),
         ("Répétition LOT/ACTIVITY", test_repetition_lot_activity_blocks),
+        ("Rendu répété depuis la mémoire", test_render_twice_from_memory),
+        ("Détection des blocs du template", test_has_block_scans_template_once),
     ]
 
     passed = 0